@@ -1,13 +1,19 @@
 """add chat_id to relevant_content
 
-Revision ID: xxxx
-Revises: previous_revision
+Revision ID: add_chat_id_to_relevant_content
+Revises:
 Create Date: 2024-03-16 18:30:00.000000
 
 """
 from alembic import op
 import sqlalchemy as sa
 
+# revision identifiers, used by Alembic.
+revision = 'add_chat_id_to_relevant_content'
+down_revision = None
+branch_labels = None
+depends_on = None
+
 def upgrade():
     # Add the new column
     op.add_column('relevant_content', sa.Column('chat_id', sa.BigInteger(), nullable=True))
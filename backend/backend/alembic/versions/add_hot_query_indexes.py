@@ -0,0 +1,70 @@
+"""add composite indexes for hot queries and unique chats(user_id, lecture_id)
+
+Revision ID: add_hot_query_indexes
+Revises: add_index_jobs_table
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'add_hot_query_indexes'
+down_revision = 'add_index_jobs_table'
+branch_labels = None
+depends_on = None
+
+# (index name, table, columns)
+INDEXES = [
+    ('ix_chats_lecture_id_user_id', 'chats', ['lecture_id', 'user_id']),
+    ('ix_chat_messages_chat_id_created_at', 'chat_messages', ['chat_id', 'created_at']),
+    ('ix_relevant_content_chat_id_created_at', 'relevant_content', ['chat_id', 'created_at']),
+    ('ix_code_submissions_user_id_created_at', 'code_submissions', ['user_id', 'created_at']),
+    ('ix_code_chat_messages_code_chat_id_created_at', 'code_chat_messages', ['code_chat_id', 'created_at']),
+    ('ix_study_search_results_lecture_id_query_created_at', 'study_search_results',
+     ['lecture_id', 'query', 'created_at']),
+    ('ix_lectures_week_id_sequence_no', 'lectures', ['week_id', 'sequence_no']),
+]
+
+# Duplicate conversations collapse into the oldest one per (user_id, lecture_id)
+DUPLICATE_CHATS = """
+    SELECT id, MIN(id) OVER (PARTITION BY user_id, lecture_id) AS keep_id FROM public.chats
+"""
+
+
+def upgrade():
+    # Move messages and retrieved content of duplicate chats onto the one being kept, then drop the rest
+    op.execute(f"""
+        UPDATE public.chat_messages cm SET chat_id = d.keep_id
+        FROM ({DUPLICATE_CHATS}) d
+        WHERE cm.chat_id = d.id AND d.id <> d.keep_id
+    """)
+    op.execute(f"""
+        UPDATE public.relevant_content rc SET chat_id = d.keep_id
+        FROM ({DUPLICATE_CHATS}) d
+        WHERE rc.chat_id = d.id AND d.id <> d.keep_id
+    """)
+    op.execute(f"""
+        DELETE FROM public.chats c
+        USING ({DUPLICATE_CHATS}) d
+        WHERE c.id = d.id AND d.id <> d.keep_id
+    """)
+
+    # CONCURRENTLY so live traffic isn't blocked while the indexes build; it can't run in a transaction
+    with op.get_context().autocommit_block():
+        op.create_index('uq_chats_user_id_lecture_id', 'chats', ['user_id', 'lecture_id'], unique=True,
+                        schema='public', postgresql_concurrently=True, if_not_exists=True)
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, unique=False, schema='public',
+                            postgresql_concurrently=True, if_not_exists=True)
+
+    op.execute(
+        "ALTER TABLE public.chats ADD CONSTRAINT uq_chats_user_id_lecture_id "
+        "UNIQUE USING INDEX uq_chats_user_id_lecture_id"
+    )
+
+
+def downgrade():
+    op.drop_constraint('uq_chats_user_id_lecture_id', 'chats', type_='unique', schema='public')
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, schema='public', postgresql_concurrently=True, if_exists=True)
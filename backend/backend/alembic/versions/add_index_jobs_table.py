@@ -0,0 +1,47 @@
+"""add index_jobs table
+
+Revision ID: add_index_jobs_table
+Revises: add_chat_id_to_relevant_content
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_index_jobs_table'
+down_revision = 'add_chat_id_to_relevant_content'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'index_jobs',
+        sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column('lecture_id', sa.BigInteger(), nullable=False),
+        sa.Column('status', sa.Text(), nullable=False, server_default='queued'),
+        sa.Column('stage', sa.Text(), nullable=False, server_default='queued'),
+        sa.Column('progress', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('reindex', sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('attempts', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('worker', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.TIMESTAMP(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('started_at', sa.TIMESTAMP(timezone=True), nullable=True),
+        sa.Column('heartbeat_at', sa.TIMESTAMP(timezone=True), nullable=True),
+        sa.Column('finished_at', sa.TIMESTAMP(timezone=True), nullable=True),
+        sa.Column('duration_seconds', sa.Float(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.ForeignKeyConstraint(['lecture_id'], ['public.lectures.id'], ondelete='CASCADE'),
+        schema='public'
+    )
+    op.create_index('ix_index_jobs_lecture_id', 'index_jobs', ['lecture_id'], unique=False, schema='public')
+    op.create_index('ix_index_jobs_status_created_at', 'index_jobs', ['status', 'created_at'], unique=False,
+                    schema='public')
+
+
+def downgrade():
+    op.drop_index('ix_index_jobs_status_created_at', table_name='index_jobs', schema='public')
+    op.drop_index('ix_index_jobs_lecture_id', table_name='index_jobs', schema='public')
+    op.drop_table('index_jobs', schema='public')
@@ -0,0 +1,86 @@
+"""
+Requests/sec and latency on the catalog endpoints of a running API server.
+
+    uvicorn main:app --port 8000 --workers 1
+    python -m benchmarks.catalog_rps --week-id 1 --concurrency 50 --seconds 20
+
+Run it once against a checkout with the sync routers and once against the async ones
+(same server flags, same database) to compare. To see threadpool starvation, keep a few
+/chats requests streaming while it runs: sync routes queue behind them, async ones don't.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+def catalog_endpoints(week_id: int):
+    return ["/subjects/", f"/weeks/{week_id}/lectures", "/lectures/"]
+
+
+async def hammer(client: httpx.AsyncClient, path: str, concurrency: int, seconds: float):
+    latencies = []
+    errors = 0
+    deadline = time.perf_counter() + seconds
+
+    async def worker():
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                response = await client.get(path)
+                if response.status_code >= 500:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "path": path,
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000 if latencies else 0.0,
+        "p95_ms": latencies[int(len(latencies) * 0.95)] * 1000 if latencies else 0.0,
+    }
+
+
+async def run(base_url: str, week_id: int, concurrency: int, seconds: float, warmup: float):
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        results = []
+        for path in catalog_endpoints(week_id):
+            # Fills the DB connection pool and any server-side caches before measuring
+            await hammer(client, path, concurrency, warmup)
+            results.append(await hammer(client, path, concurrency, seconds))
+        return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure requests/sec on the catalog endpoints.")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--week-id", type=int, default=1)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--seconds", type=float, default=10, help="Measurement time per endpoint")
+    parser.add_argument("--warmup", type=float, default=2, help="Unmeasured time per endpoint")
+    args = parser.parse_args()
+
+    print(f"🏁 {args.base_url}, {args.concurrency} concurrent clients, {args.seconds:.0f}s per endpoint")
+    results = asyncio.run(run(args.base_url, args.week_id, args.concurrency, args.seconds, args.warmup))
+
+    print(f"\n{'endpoint':<24} {'requests':>9} {'errors':>7} {'req/s':>8} {'p50 (ms)':>9} {'p95 (ms)':>9}")
+    for r in results:
+        print(f"{r['path']:<24} {r['requests']:>9} {r['errors']:>7} {r['rps']:>8.1f} "
+              f"{r['p50_ms']:>9.1f} {r['p95_ms']:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Real-time factor (transcription time / audio duration) per transcription backend.
+
+    python -m benchmarks.transcription_rtf downloads/lecture_1.mp3
+    python -m benchmarks.transcription_rtf sample.wav --backends faster-whisper --model-size base --compute-type int8
+
+RTF < 1 means faster than real time. Model load time is reported separately.
+"""
+import argparse
+import time
+
+from pydub import AudioSegment
+
+from utils.streaming_transcription import to_whisper_samples
+from utils.transcription import (
+    TRANSCRIPTION_BACKENDS,
+    WHISPER_COMPUTE_TYPE,
+    WHISPER_MODEL_SIZE,
+    load_transcription_backend,
+)
+
+
+def benchmark_backend(name: str, samples, duration: float, model_size: str, compute_type: str, runs: int):
+    started = time.perf_counter()
+    backend = load_transcription_backend(name, model_size, compute_type)
+    load_seconds = time.perf_counter() - started
+
+    timings = []
+    segments = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        segments = backend.transcribe(samples)
+        timings.append(time.perf_counter() - started)
+
+    best = min(timings)
+    return {
+        "backend": repr(backend),
+        "load_s": load_seconds,
+        "transcribe_s": best,
+        "rtf": best / duration,
+        "segments": len(segments),
+        "words": sum(len(segment["text"].split()) for segment in segments)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report real-time factor per transcription backend.")
+    parser.add_argument("audio", help="Local audio file (anything ffmpeg can decode)")
+    parser.add_argument("--backends", nargs="*", default=sorted(TRANSCRIPTION_BACKENDS))
+    parser.add_argument("--model-size", default=WHISPER_MODEL_SIZE)
+    parser.add_argument("--compute-type", default=WHISPER_COMPUTE_TYPE)
+    parser.add_argument("--seconds", type=float, default=None, help="Only use the first N seconds of the file")
+    parser.add_argument("--runs", type=int, default=1, help="Transcriptions per backend; the fastest is reported")
+    args = parser.parse_args()
+
+    audio = AudioSegment.from_file(args.audio)
+    if args.seconds:
+        audio = audio[:int(args.seconds * 1000)]
+    duration = len(audio) / 1000
+    samples = to_whisper_samples(audio)
+    print(f"🎧 {args.audio}: {duration:.1f}s of audio")
+
+    results = []
+    for name in args.backends:
+        try:
+            results.append(benchmark_backend(name, samples, duration, args.model_size, args.compute_type, args.runs))
+        except Exception as e:
+            print(f"❌ {name}: {e}")
+
+    print(f"\n{'backend':<40} {'load (s)':>9} {'transcribe (s)':>15} {'RTF':>7} {'segments':>9} {'words':>7}")
+    for r in results:
+        print(f"{r['backend']:<40} {r['load_s']:>9.1f} {r['transcribe_s']:>15.1f} {r['rtf']:>7.3f} "
+              f"{r['segments']:>9} {r['words']:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Confirms the planner can use (and does use) the indexes from the add_hot_query_indexes migration.
+
+    python -m database.check_indexes
+
+Each hot query is EXPLAINed twice with real parameter values from the table:
+- "usable": with sequential scans disabled, the plan must go through one of the expected indexes.
+  This fails only if the index is missing or can't serve the query.
+- "chosen": with default planner settings. Small tables are often seq-scanned; that's expected
+  and only reported, not treated as a failure.
+Exits non-zero if any index is not usable.
+"""
+import json
+import sys
+
+from sqlalchemy import text
+
+from database.database import engine
+
+# (description, query, sample query for parameter values, fallback parameters, indexes that satisfy it)
+HOT_QUERIES = [
+    (
+        "conversation lookup (send_message)",
+        "SELECT * FROM public.chats WHERE lecture_id = :lecture_id AND user_id = :user_id",
+        "SELECT lecture_id, user_id FROM public.chats LIMIT 1",
+        {"lecture_id": 0, "user_id": 0},
+        {"uq_chats_user_id_lecture_id", "ix_chats_lecture_id_user_id"},
+    ),
+    (
+        "lecture chat history",
+        "SELECT * FROM public.chats WHERE lecture_id = :lecture_id",
+        "SELECT lecture_id FROM public.chats LIMIT 1",
+        {"lecture_id": 0},
+        {"ix_chats_lecture_id_user_id"},
+    ),
+    (
+        "chat messages in order",
+        "SELECT * FROM public.chat_messages WHERE chat_id = :chat_id ORDER BY created_at",
+        "SELECT chat_id FROM public.chat_messages LIMIT 1",
+        {"chat_id": 0},
+        {"ix_chat_messages_chat_id_created_at"},
+    ),
+    (
+        "latest relevant content",
+        "SELECT * FROM public.relevant_content WHERE chat_id = :chat_id ORDER BY created_at DESC LIMIT 1",
+        "SELECT chat_id FROM public.relevant_content LIMIT 1",
+        {"chat_id": 0},
+        {"ix_relevant_content_chat_id_created_at"},
+    ),
+    (
+        "user's code submissions",
+        "SELECT * FROM public.code_submissions WHERE user_id = :user_id ORDER BY created_at DESC",
+        "SELECT user_id FROM public.code_submissions LIMIT 1",
+        {"user_id": 0},
+        {"ix_code_submissions_user_id_created_at"},
+    ),
+    (
+        "code chat messages in order",
+        "SELECT * FROM public.code_chat_messages WHERE code_chat_id = :code_chat_id ORDER BY created_at",
+        "SELECT code_chat_id FROM public.code_chat_messages LIMIT 1",
+        {"code_chat_id": 0},
+        {"ix_code_chat_messages_code_chat_id_created_at"},
+    ),
+    (
+        "cached study search results",
+        "SELECT * FROM public.study_search_results WHERE lecture_id = :lecture_id AND query = :query "
+        "AND created_at >= now() - interval '24 hours' ORDER BY created_at DESC LIMIT 5",
+        "SELECT lecture_id, query FROM public.study_search_results WHERE query IS NOT NULL LIMIT 1",
+        {"lecture_id": 0, "query": ""},
+        {"ix_study_search_results_lecture_id_query_created_at"},
+    ),
+    (
+        "week's lectures in order",
+        "SELECT * FROM public.lectures WHERE week_id = :week_id ORDER BY sequence_no",
+        "SELECT week_id FROM public.lectures LIMIT 1",
+        {"week_id": 0},
+        {"ix_lectures_week_id_sequence_no"},
+    ),
+]
+
+
+def plan_indexes(node: dict) -> set:
+    """Every index name referenced anywhere in an EXPLAIN (FORMAT JSON) plan tree."""
+    names = {node["Index Name"]} if "Index Name" in node else set()
+    for child in node.get("Plans", []):
+        names |= plan_indexes(child)
+    return names
+
+
+def explain(connection, query: str, params: dict, seqscan: bool) -> set:
+    with connection.begin():
+        if not seqscan:
+            connection.execute(text("SET LOCAL enable_seqscan = off"))
+        rows = connection.execute(text(f"EXPLAIN (FORMAT JSON) {query}"), params).scalar()
+    plan = rows if isinstance(rows, list) else json.loads(rows)
+    return plan_indexes(plan[0]["Plan"])
+
+
+def check_indexes() -> bool:
+    ok = True
+    with engine.connect() as connection:
+        for description, query, sample_query, fallback, expected in HOT_QUERIES:
+            with connection.begin():
+                sample = connection.execute(text(sample_query)).mappings().first()
+            params = dict(sample) if sample else fallback
+
+            usable = explain(connection, query, params, seqscan=False) & expected
+            chosen = explain(connection, query, params, seqscan=True) & expected
+
+            if not usable:
+                ok = False
+                print(f"❌ {description}: none of {sorted(expected)} is usable")
+            elif chosen:
+                print(f"✅ {description}: uses {', '.join(sorted(chosen))}")
+            else:
+                print(f"⚠️  {description}: {', '.join(sorted(usable))} is usable, "
+                      f"but the planner prefers a seq scan at the current table size")
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if check_indexes() else 1)
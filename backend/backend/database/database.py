@@ -1,4 +1,7 @@
+from uuid import uuid4
+
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from dotenv import load_dotenv
 
@@ -13,6 +16,7 @@ port = 6543
 
 
 SQLALCHEMY_DATABASE_URL = f"postgresql://{user}:{password}@{host}:{port}/{database}"
+ASYNC_SQLALCHEMY_DATABASE_URL = f"postgresql+asyncpg://{user}:{password}@{host}:{port}/{database}"
 
 # Create-engine part remains the same, so this is not necessary in generator.
 engine = create_engine(SQLALCHEMY_DATABASE_URL,
@@ -28,6 +32,24 @@ print(SQLALCHEMY_DATABASE_URL)
 
 SessionLocal = sessionmaker(bind=engine, autoflush=False)
 
+# ✅ Async engine for the routers: DB waits no longer hold one of the threadpool slots
+# the LLM routes (chats, code_exercises) need. Same pool settings as the sync engine.
+async_engine = create_async_engine(ASYNC_SQLALCHEMY_DATABASE_URL,
+                                   pool_size=10,
+                                   max_overflow=20,
+                                   pool_timeout=30,
+                                   pool_recycle=1800,
+                                   pool_pre_ping=True,
+                                   # pgbouncer (transaction mode, port 6543) can't keep asyncpg's
+                                   # prepared statements across transactions, so don't cache them
+                                   connect_args={
+                                       "statement_cache_size": 0,
+                                       "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+                                   },
+                                   )
+
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
 
 def get_db():
     """Provide a transactional scope around a series of operations."""
@@ -40,3 +62,14 @@ def get_db():
         raise
     finally:
         session.close()
+
+
+async def get_async_db():
+    """Async counterpart of get_db for `async def` routes."""
+    async with AsyncSessionLocal() as session:
+        try:
+            yield session
+            await session.commit()
+        except:
+            await session.rollback()
+            raise
@@ -0,0 +1,172 @@
+import json
+import os
+import shutil
+import threading
+import time
+
+import numpy as np
+from langchain_core.documents import Document
+
+POINTER_FILE = "current.json"
+# float16 snapshots are upcast this many rows at a time: NumPy has no BLAS kernel for float16
+UPCAST_BLOCK_ROWS = 2048
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def export_numpy_store(directory: str, ids: list, embeddings, documents: list, metadatas: list,
+                       dtype: str = "float32"):
+    """
+    Writes a new snapshot of the exact-search files and atomically points `current.json` at it:
+
+    - embeddings.npy: (n, d) L2-normalized chunk embeddings (float32; float16 halves disk/RAM but searches slower)
+    - metadata.npy:   structured array parallel to the rows (lecture_id, start_time, end_time, youtube_url)
+    - documents.json: chunk ids and transcript text, same order
+
+    The previous snapshot is kept, since readers in other processes may have just read the old
+    pointer and not opened its files yet; anything older than that is deleted.
+    """
+    matrix = _normalize_rows(np.asarray(embeddings, dtype=np.float32)).astype(dtype)
+    url_width = max([len(m.get("youtube_url") or "") for m in metadatas] + [1])
+    metadata = np.array(
+        [
+            (m["lecture_id"], m["start_time"], m["end_time"], m.get("youtube_url") or "")
+            for m in metadatas
+        ],
+        dtype=[("lecture_id", "i8"), ("start_time", "f8"), ("end_time", "f8"), ("youtube_url", f"U{url_width}")]
+    )
+
+    version = f"v{int(time.time() * 1000)}"
+    snapshot = os.path.join(directory, version)
+    os.makedirs(snapshot, exist_ok=True)
+    np.save(os.path.join(snapshot, "embeddings.npy"), matrix)
+    np.save(os.path.join(snapshot, "metadata.npy"), metadata)
+    with open(os.path.join(snapshot, "documents.json"), "w", encoding="utf-8") as f:
+        json.dump({"ids": list(ids), "texts": list(documents)}, f)
+
+    pointer = os.path.join(directory, POINTER_FILE)
+    previous = None
+    try:
+        with open(pointer, "r", encoding="utf-8") as f:
+            previous = json.load(f).get("version")
+    except (OSError, ValueError):
+        pass
+    with open(pointer + ".tmp", "w", encoding="utf-8") as f:
+        json.dump({"version": version, "rows": int(matrix.shape[0]), "dtype": dtype}, f)
+    os.replace(pointer + ".tmp", pointer)
+
+    for name in os.listdir(directory):
+        path = os.path.join(directory, name)
+        if name not in (version, previous) and name.startswith("v") and os.path.isdir(path):
+            shutil.rmtree(path, ignore_errors=True)
+
+    print(f"✅ Exported {matrix.shape[0]} chunk embeddings to {snapshot}")
+
+
+def _scores(matrix: np.ndarray, vector: np.ndarray) -> np.ndarray:
+    """Dot products in float32 (BLAS); float16 matrices are upcast block by block."""
+    if matrix.dtype == np.float32:
+        return matrix @ vector
+    scores = np.empty(matrix.shape[0], dtype=np.float32)
+    for start in range(0, matrix.shape[0], UPCAST_BLOCK_ROWS):
+        block = matrix[start:start + UPCAST_BLOCK_ROWS]
+        scores[start:start + len(block)] = block.astype(np.float32) @ vector
+    return scores
+
+
+class NumpyVectorStore:
+    """
+    Exact top-k search over a memory-mapped embedding matrix.
+
+    One matmul plus `argpartition` per query; `lecture_id` filters select rows from the
+    parallel metadata array first. Every worker maps the same files, so the pages are shared.
+    """
+
+    def __init__(self, directory: str, embedding_function):
+        self.directory = directory
+        self.embedding_function = embedding_function
+        self._version = None
+        self._snapshot = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        try:
+            return self._load_current()
+        except FileNotFoundError:
+            # The pointer moved on and our version was pruned between reading it and opening the files
+            return self._load_current()
+
+    def _load_current(self):
+        pointer = os.path.join(self.directory, POINTER_FILE)
+        try:
+            with open(pointer, "r", encoding="utf-8") as f:
+                version = json.load(f)["version"]
+        except (OSError, ValueError, KeyError):
+            # Nothing exported yet: an open store with no rows (like an empty Chroma), not an error
+            return None
+
+        if version == self._version:
+            return self._snapshot
+
+        with self._lock:
+            if version != self._version:
+                snapshot = os.path.join(self.directory, version)
+                with open(os.path.join(snapshot, "documents.json"), "r", encoding="utf-8") as f:
+                    documents = json.load(f)
+                self._snapshot = {
+                    "embeddings": np.load(os.path.join(snapshot, "embeddings.npy"), mmap_mode="r"),
+                    "metadata": np.load(os.path.join(snapshot, "metadata.npy"), mmap_mode="r"),
+                    "ids": documents["ids"],
+                    "texts": documents["texts"]
+                }
+                self._version = version
+                print(f"📂 Mapped {len(documents['ids'])} chunk embeddings from {snapshot}")
+        return self._snapshot
+
+    def similarity_search(self, query: str, k: int = 5, filter: dict = None):
+        snapshot = self._load()
+        if snapshot is None:
+            return []
+        matrix = snapshot["embeddings"]
+        metadata = snapshot["metadata"]
+
+        vector = np.asarray(self.embedding_function.embed_query(query), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        if norm:
+            vector /= norm
+
+        lecture_id = (filter or {}).get("lecture_id")
+        if lecture_id is not None:
+            rows = np.flatnonzero(metadata["lecture_id"] == lecture_id)
+            scores = _scores(matrix[rows], vector)
+        else:
+            rows = None
+            scores = _scores(matrix, vector)
+
+        if scores.shape[0] == 0:
+            return []
+
+        k = min(k, scores.shape[0])
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        if rows is not None:
+            top = rows[top]
+
+        results = []
+        for row in top:
+            meta = metadata[row]
+            results.append(Document(
+                page_content=snapshot["texts"][row],
+                metadata={
+                    "lecture_id": int(meta["lecture_id"]),
+                    "start_time": float(meta["start_time"]),
+                    "end_time": float(meta["end_time"]),
+                    "youtube_url": str(meta["youtube_url"]),
+                    "text": snapshot["texts"][row]
+                }
+            ))
+        return results
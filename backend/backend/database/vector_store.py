@@ -0,0 +1,107 @@
+import threading
+import time
+
+from langchain_chroma import Chroma
+from langchain_core.documents import Document
+
+from database.numpy_store import NumpyVectorStore
+from utils.bm25_index import ReloadingBM25Index, reciprocal_rank_fusion
+from utils.metrics import Histogram
+
+LATENCY_MS_BUCKETS = [5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000]
+
+
+class VectorStoreManager:
+    """
+    Opens the persistent Chroma store once per process and shares it across request threads.
+    Query calls go straight to the already-open collection; open and query latency are recorded.
+
+    When a BM25 index path is given, `hybrid_search` fuses lexical and vector rankings.
+    With `backend="numpy"`, vector queries go to the memory-mapped exact-search export instead of Chroma.
+    """
+
+    def __init__(self, persist_directory: str, embedding_function, lexical_index_path: str = None,
+                 backend: str = "chroma", numpy_store_path: str = None):
+        if backend not in ("chroma", "numpy"):
+            raise ValueError(f"Unknown retrieval backend: {backend}")
+        self.persist_directory = persist_directory
+        self.embedding_function = embedding_function
+        self.backend = backend
+        self.numpy_store = NumpyVectorStore(numpy_store_path, embedding_function) if backend == "numpy" else None
+        self.lexical_index = ReloadingBM25Index(lexical_index_path) if lexical_index_path else None
+        self.open_ms = None
+        self.ready = False  # Set after the first successful query
+        self.query_latency_ms = Histogram(LATENCY_MS_BUCKETS)
+
+        self._store = None
+        self._lock = threading.Lock()
+
+    def get(self) -> Chroma:
+        if self._store is not None:
+            return self._store
+
+        with self._lock:
+            if self._store is None:
+                started_at = time.perf_counter()
+                self._store = Chroma(persist_directory=self.persist_directory,
+                                     embedding_function=self.embedding_function)
+                self.open_ms = round((time.perf_counter() - started_at) * 1000, 2)
+                print(f"📂 Opened vector store at {self.persist_directory} in {self.open_ms} ms")
+        return self._store
+
+    def warm(self):
+        """Opens the store and runs one query so the embedding model and HNSW index are loaded."""
+        self.similarity_search("warmup", k=1)
+
+    def similarity_search(self, query: str, k: int = 5, filter: dict = None):
+        store = self.numpy_store or self.get()
+        started_at = time.perf_counter()
+        try:
+            results = store.similarity_search(query, k=k, filter=filter)
+            self.ready = True
+            return results
+        finally:
+            self.query_latency_ms.observe((time.perf_counter() - started_at) * 1000)
+
+    def hybrid_search(self, query: str, k: int = 5, filter: dict = None, candidates: int = None):
+        """
+        Reciprocal rank fusion of BM25 and vector results. Exact-term queries ("SRS", "BDD")
+        surface through the lexical ranking even when MiniLM similarity misses them.
+        Falls back to pure vector search when no lexical index has been built yet.
+        """
+        lexical_index = self.lexical_index.get() if self.lexical_index else None
+        if lexical_index is None:
+            return self.similarity_search(query, k=k, filter=filter)
+
+        candidates = candidates or k * 4
+        lecture_id = (filter or {}).get("lecture_id")
+
+        vector_docs = self.similarity_search(query, k=candidates, filter=filter)
+        lexical_hits = lexical_index.search(query, k=candidates, lecture_id=lecture_id)
+
+        by_id = {chunk_id(doc.metadata): doc for doc in vector_docs}
+        for doc_id, _ in lexical_hits:
+            if doc_id not in by_id:
+                document = lexical_index.documents[doc_id]
+                by_id[doc_id] = Document(page_content=document["text"], metadata=document["metadata"])
+
+        fused = reciprocal_rank_fusion([
+            [chunk_id(doc.metadata) for doc in vector_docs],
+            [doc_id for doc_id, _ in lexical_hits]
+        ])
+        return [by_id[doc_id] for doc_id in fused[:k]]
+
+    def stats(self) -> dict:
+        return {
+            "backend": self.backend,
+            "persist_directory": self.persist_directory,
+            "open": self._store is not None,
+            "ready": self.ready,
+            "open_ms": self.open_ms,
+            "query_latency_ms": self.query_latency_ms.snapshot()
+        }
+
+
+def chunk_id(metadata: dict) -> str:
+    """The id a transcript chunk is stored under in both Chroma and the BM25 index."""
+    return f"{metadata['lecture_id']}_{metadata['start_time']}"
@@ -0,0 +1,81 @@
+"""
+Ingestion entry point: transcription, embedding and indexing of video lectures.
+
+    python ingest.py index [--parallel ...] [--lecture-ids 1 2] [--force]
+    python ingest.py worker [--once]
+
+Runs separately from the API (main.py), which never loads Whisper or yt_dlp.
+"""
+import argparse
+
+from utils.chunking import CHUNK_STRATEGIES, chunking_config
+
+
+def run_index(args):
+    from utils.index_lectures import get_video_lectures, index_all_lectures, index_lecture_video
+
+    chunking = chunking_config(args.chunking, args.chunk_tokens, args.chunk_overlap)
+
+    if args.parallel:
+        from utils.parallel_indexing import index_lectures_parallel
+
+        index_lectures_parallel(
+            get_video_lectures(args.lecture_ids),
+            download_workers=args.download_workers,
+            transcribe_workers=args.transcribe_workers,
+            embed_workers=args.embed_workers,
+            resume=args.resume,
+            reindex=args.force,
+            chunking=chunking
+        )
+    elif args.lecture_ids:
+        for lecture_id, url in get_video_lectures(args.lecture_ids):
+            index_lecture_video(lecture_id=lecture_id, youtube_url=url, reindex=args.force,
+                                streaming=not args.whole_file, chunking=chunking)
+    else:
+        index_all_lectures(reindex=args.force, streaming=not args.whole_file, chunking=chunking)
+
+
+def run_worker(args):
+    from utils.index_worker import work
+
+    work(once=args.once)
+
+
+def add_index_arguments(parser):
+    parser.add_argument("--parallel", action="store_true", help="Run downloads, transcription and embedding in pools")
+    parser.add_argument("--download-workers", type=int, default=4)
+    parser.add_argument("--transcribe-workers", type=int, default=2)
+    parser.add_argument("--embed-workers", type=int, default=1)
+    parser.add_argument("--resume", action="store_true", help="Skip lectures completed by a previous parallel run")
+    parser.add_argument("--lecture-ids", type=int, nargs="*", help="Only index these lectures")
+    parser.add_argument("--force", action="store_true", help="Re-transcribe even if the manifest says nothing changed")
+    parser.add_argument("--whole-file", action="store_true",
+                        help="Transcribe each lecture in one pass instead of indexing it window by window")
+    parser.add_argument("--chunking", choices=CHUNK_STRATEGIES, help="One chunk per segment, or merged windows")
+    parser.add_argument("--chunk-tokens", type=int, help="Max words per merged chunk")
+    parser.add_argument("--chunk-overlap", type=int, help="Words repeated from the previous merged chunk")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Transcribe and index video lectures into ChromaDB.")
+    subparsers = parser.add_subparsers(dest="command")
+
+    index_parser = subparsers.add_parser("index", help="Index lectures now (default)")
+    add_index_arguments(index_parser)
+    index_parser.set_defaults(handler=run_index)
+
+    worker_parser = subparsers.add_parser("worker", help="Process queued index jobs")
+    worker_parser.add_argument("--once", action="store_true", help="Exit once the queue is empty")
+    worker_parser.set_defaults(handler=run_worker)
+
+    # `python ingest.py --force` is shorthand for `python ingest.py index --force`
+    add_index_arguments(parser)
+    parser.set_defaults(handler=run_index)
+
+    args = parser.parse_args(argv)
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
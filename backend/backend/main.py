@@ -1,10 +1,36 @@
+import time
+from contextlib import asynccontextmanager
+
+_started_at = time.perf_counter()
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
 from routes import api_router
+from routes.chats import embeddings, vector_store
+from utils.config import assert_no_ingestion_imports
+from utils.llm_service import is_llm_loaded, load_llm_service
+from utils.warmup import WARMUP_ON_STARTUP, warmup
 # from .routes import api_router
 
-app = FastAPI()
+print(f"⏱️ Imported routes in {time.perf_counter() - _started_at:.1f}s")
+
+# ✅ AI components load in the background; everything else serves as soon as the app starts
+warmup.register("embeddings", embeddings.load, lambda: embeddings.loaded)
+warmup.register("vector_store", vector_store.warm, lambda: vector_store.ready)
+warmup.register("llm", load_llm_service, is_llm_loaded)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if WARMUP_ON_STARTUP:
+        warmup.start()
+    print(f"🚀 API ready for requests {time.perf_counter() - _started_at:.1f}s after start")
+    yield
+
+
+app = FastAPI(lifespan=lifespan)
 origins = [
     # "*"
     'http://localhost:5173', 'http://127.0.0.1:5173'
@@ -15,10 +41,31 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Let the frontend read catalog ETags and pagination cursors
+    expose_headers=["ETag", "X-Next-Cursor"],
 )
 app.include_router(api_router)
 
+# ✅ The API never transcribes: Whisper / yt_dlp belong to ingest.py and the index worker
+assert_no_ingestion_imports()
+
 
 @app.get("/")
 async def root():
     return {"message": "Hello World"}
+
+
+@app.get("/healthz")
+async def healthz():
+    """The process is up and serving requests."""
+    return {"status": "ok"}
+
+
+@app.get("/readyz")
+def readyz():
+    """Models and vector store are loaded; 503 until then."""
+    ready, components = warmup.status()
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={"status": "ready" if ready else "warming_up", "components": components}
+    )
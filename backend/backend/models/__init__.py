@@ -7,3 +7,4 @@ from .lectures import Lecture, RelevantContent, StudySearchResult
 from .chats import Chat, ChatMessage
 from .code_exercises import CodeExercise, TestCase, CodeSubmission, CodeChat, CodeChatMessage
 from .quiz import Quiz
+from .index_jobs import IndexJob
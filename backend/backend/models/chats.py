@@ -1,11 +1,15 @@
-from sqlalchemy import Column, BigInteger, Text, ForeignKey, TIMESTAMP, func, Boolean
+from sqlalchemy import Column, BigInteger, Text, ForeignKey, TIMESTAMP, func, Boolean, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 from models.base import Base
 
 
 class Chat(Base):
     __tablename__ = "chats"
-    __table_args__ = {"schema": "public"}
+    __table_args__ = (
+        UniqueConstraint("user_id", "lecture_id", name="uq_chats_user_id_lecture_id"),  # One conversation per lecture
+        Index("ix_chats_lecture_id_user_id", "lecture_id", "user_id"),
+        {"schema": "public"}
+    )
 
     id = Column(BigInteger, primary_key=True, autoincrement=True)
     user_id = Column(BigInteger, ForeignKey("public.users.id"), nullable=False)  # Links to a user
@@ -19,7 +23,10 @@ class Chat(Base):
 
 class ChatMessage(Base):
     __tablename__ = "chat_messages"
-    __table_args__ = {"schema": "public"}
+    __table_args__ = (
+        Index("ix_chat_messages_chat_id_created_at", "chat_id", "created_at"),
+        {"schema": "public"}
+    )
 
     id = Column(BigInteger, primary_key=True, autoincrement=True)
     chat_id = Column(BigInteger, ForeignKey("public.chats.id"), nullable=False)  # Groups messages
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, BigInteger, Text, ForeignKey, TIMESTAMP, func, Boolean, Integer
+from sqlalchemy import Column, BigInteger, Text, ForeignKey, TIMESTAMP, func, Boolean, Integer, Index
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from models.base import Base
@@ -55,7 +55,10 @@ class CodeSubmission(Base):
     Represents a student's submission for a coding exercise.
     """
     __tablename__ = "code_submissions"
-    __table_args__ = {"schema": "public"}
+    __table_args__ = (
+        Index("ix_code_submissions_user_id_created_at", "user_id", "created_at"),
+        {"schema": "public"}
+    )
 
     id = Column(BigInteger, primary_key=True, autoincrement=True)
     user_id = Column(BigInteger, ForeignKey("public.users.id"), nullable=False)
@@ -103,7 +106,10 @@ class CodeChatMessage(Base):
     Represents a message in a code chat session.
     """
     __tablename__ = "code_chat_messages"
-    __table_args__ = {"schema": "public"}
+    __table_args__ = (
+        Index("ix_code_chat_messages_code_chat_id_created_at", "code_chat_id", "created_at"),
+        {"schema": "public"}
+    )
 
     id = Column(BigInteger, primary_key=True, autoincrement=True)
     code_chat_id = Column(BigInteger, ForeignKey("public.code_chats.id"), nullable=False)
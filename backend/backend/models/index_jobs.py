@@ -0,0 +1,31 @@
+from sqlalchemy import Column, BigInteger, Text, Float, Boolean, ForeignKey, TIMESTAMP, Index, func
+from sqlalchemy.orm import relationship
+from models.base import Base
+
+
+class IndexJob(Base):
+    __tablename__ = "index_jobs"
+    __table_args__ = (
+        Index("ix_index_jobs_status_created_at", "status", "created_at"),
+        {"schema": "public"}
+    )
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    lecture_id = Column(BigInteger, ForeignKey("public.lectures.id", ondelete="CASCADE"), nullable=False, index=True)
+    status = Column(Text, nullable=False, default="queued")  # "queued", "running", "succeeded" or "failed"
+    stage = Column(Text, nullable=False, default="queued")  # "queued", "downloading", "transcribing", "embedding", "done"
+    progress = Column(Float, nullable=False, default=0.0)  # 0.0 - 1.0 across all stages
+    reindex = Column(Boolean, nullable=False, default=False)  # Re-transcribe even if nothing changed
+    error = Column(Text, nullable=True)
+    attempts = Column(BigInteger, nullable=False, default=0)
+    worker = Column(Text, nullable=True)  # host:pid of the worker that claimed it
+    created_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
+    started_at = Column(TIMESTAMP(timezone=True), nullable=True)
+    heartbeat_at = Column(TIMESTAMP(timezone=True), nullable=True)  # Last progress update from the worker
+    finished_at = Column(TIMESTAMP(timezone=True), nullable=True)
+    duration_seconds = Column(Float, nullable=True)
+
+    lecture = relationship("Lecture", backref="index_jobs")
+
+    def __repr__(self):
+        return f"<IndexJob(id={self.id}, lecture_id={self.lecture_id}, status={self.status}, stage={self.stage})>"
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, BigInteger, TIMESTAMP, Text, ForeignKey, func
+from sqlalchemy import Column, BigInteger, TIMESTAMP, Text, ForeignKey, Index, func
 from sqlalchemy.dialects.postgresql import JSONB
 from models.base import Base
 from sqlalchemy.orm import relationship
@@ -6,7 +6,10 @@ from sqlalchemy.orm import relationship
 
 class Lecture(Base):
     __tablename__ = "lectures"
-    __table_args__ = {"schema": "public"}  # Explicit schema
+    __table_args__ = (
+        Index("ix_lectures_week_id_sequence_no", "week_id", "sequence_no"),
+        {"schema": "public"}  # Explicit schema
+    )
 
     id = Column(BigInteger, primary_key=True, autoincrement=True)
     created_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
@@ -24,7 +27,10 @@ class Lecture(Base):
 
 class RelevantContent(Base):
     __tablename__ = "relevant_content"
-    __table_args__ = {"schema": "public"}
+    __table_args__ = (
+        Index("ix_relevant_content_chat_id_created_at", "chat_id", "created_at"),
+        {"schema": "public"}
+    )
 
     id = Column(BigInteger, primary_key=True, autoincrement=True)
     chat_id = Column(BigInteger, ForeignKey("public.chats.id"), nullable=False)
@@ -44,7 +50,10 @@ class RelevantContent(Base):
 
 class StudySearchResult(Base):
     __tablename__ = "study_search_results"
-    __table_args__ = {"schema": "public"}
+    __table_args__ = (
+        Index("ix_study_search_results_lecture_id_query_created_at", "lecture_id", "query", "created_at"),
+        {"schema": "public"}
+    )
     id = Column(BigInteger, primary_key=True, index=True)
     lecture_id = Column(BigInteger, ForeignKey("public.lectures.id", ondelete="CASCADE"), nullable=False)
     query = Column(Text, index=True)
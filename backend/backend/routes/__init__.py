@@ -13,7 +13,8 @@ from . import (
     users,
     settings,
     code_exercises,
-    gemini_chat
+    gemini_chat,
+    metrics
 )
 
 api_router = APIRouter()
@@ -29,4 +30,5 @@ api_router.include_router(code_exercises.router, prefix="/code-exercises", tags=
 api_router.include_router(dashboards.router, prefix="/dashboards", tags=["dashboards"])
 api_router.include_router(users.router, prefix="/users", tags=["users"])
 api_router.include_router(settings.router, prefix="/users", tags=["users"])
-api_router.include_router(gemini_chat.router, prefix="/chat", tags=["chat"])
\ No newline at end of file
+api_router.include_router(gemini_chat.router, prefix="/chat", tags=["chat"])
+api_router.include_router(metrics.router, prefix="/metrics", tags=["metrics"])
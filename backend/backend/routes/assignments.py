@@ -1,6 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from database.database import get_db
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from database.database import get_async_db
+from utils.catalog_cache import catalog_cache
 from models import Assignment
 from pydantic import BaseModel
 from typing import List, Dict, Any, Optional
@@ -24,13 +26,14 @@ class AssignmentResponse(AssignmentRequest):
 
 
 @router.get("/", response_model=List[AssignmentResponse])
-def get_assignments(week_id: Optional[int] = None, db: Session = Depends(get_db)):
-    query = db.query(Assignment)
+async def get_assignments(week_id: Optional[int] = None, db: AsyncSession = Depends(get_async_db)):
+    query = select(Assignment)
 
     if week_id:
-        query = query.filter(Assignment.week_id == week_id)
+        query = query.where(Assignment.week_id == week_id)
 
-    assignments = query.order_by(Assignment.week_id, Assignment.sequence_no).all()
+    result = await db.execute(query.order_by(Assignment.week_id, Assignment.sequence_no))
+    assignments = result.scalars().all()
 
     if not assignments:
         raise HTTPException(status_code=404, detail="No assignments found")
@@ -39,7 +42,7 @@ def get_assignments(week_id: Optional[int] = None, db: Session = Depends(get_db)
 
 
 @router.post("/", response_model=AssignmentResponse)
-def create_assignment(request: AssignmentRequest, db: Session = Depends(get_db)):
+async def create_assignment(request: AssignmentRequest, db: AsyncSession = Depends(get_async_db)):
     new_assignment = Assignment(
         week_id=request.week_id,
         sequence_no=request.sequence_no,
@@ -48,7 +51,8 @@ def create_assignment(request: AssignmentRequest, db: Session = Depends(get_db))
     )
 
     db.add(new_assignment)
-    db.commit()
-    db.refresh(new_assignment)
+    await db.commit()
+    await db.refresh(new_assignment)
+    catalog_cache.invalidate()
 
     return new_assignment
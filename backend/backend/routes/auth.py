@@ -2,11 +2,13 @@ import datetime
 
 import bcrypt
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
 import jwt
 from pydantic import BaseModel, EmailStr
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from database.database import get_db
+from database.database import get_async_db
 from models import User
 from utils.auth import SECRET_KEY, get_current_user
 
@@ -19,12 +21,13 @@ class LoginRequest(BaseModel):
 
 
 @router.post("/login")
-def login(request: LoginRequest, db: Session = Depends(get_db)):
+async def login(request: LoginRequest, db: AsyncSession = Depends(get_async_db)):
     # Fetch user by email
-    user = db.query(User).filter(User.email == request.email).first()
+    result = await db.execute(select(User).where(User.email == request.email))
+    user = result.scalars().first()
 
-    # If user not found or password doesn't match
-    if not user or not bcrypt.checkpw(request.password.encode(), user.password.encode()):
+    # If user not found or password doesn't match (bcrypt is slow on purpose; keep it off the event loop)
+    if not user or not await run_in_threadpool(bcrypt.checkpw, request.password.encode(), user.password.encode()):
         raise HTTPException(status_code=401, detail="Invalid email or password")
 
     # Generate JWT token
@@ -46,14 +49,15 @@ class RegisterRequest(BaseModel):
 
 
 @router.post("/register")
-def register(request: RegisterRequest, db: Session = Depends(get_db)):
+async def register(request: RegisterRequest, db: AsyncSession = Depends(get_async_db)):
     # Check if user already exists
-    existing_user = db.query(User).filter(User.email == request.email).first()
+    result = await db.execute(select(User).where(User.email == request.email))
+    existing_user = result.scalars().first()
     if existing_user:
         raise HTTPException(status_code=400, detail="Email already registered")
 
     # Hash the password
-    hashed_password = bcrypt.hashpw(request.password.encode(), bcrypt.gensalt()).decode()
+    hashed_password = (await run_in_threadpool(bcrypt.hashpw, request.password.encode(), bcrypt.gensalt())).decode()
 
     # Create a new user
     new_user = User(
@@ -64,13 +68,14 @@ def register(request: RegisterRequest, db: Session = Depends(get_db)):
     )
 
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
+    await db.refresh(new_user)
 
     return {"message": "User registered successfully", "user_id": new_user.id}
 
 
 @router.get("/me")
-def get_me(db: Session = Depends(get_db), currentUser=Depends(get_current_user)):
+async def get_me(db: AsyncSession = Depends(get_async_db), currentUser=Depends(get_current_user)):
     print(currentUser)
-    return db.query(User).filter(User.id == currentUser).first()
+    # asyncpg doesn't coerce the token's string subject into the bigint id column
+    return await db.get(User, int(currentUser))
@@ -1,21 +1,26 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy import and_
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, selectinload
 
-from database.chroma_db import get_chroma_collection
-from database.database import get_db
+from database.database import SessionLocal, get_db
+from database.vector_store import VectorStoreManager
 from models import Chat, ChatMessage, RelevantContent
 
 from pydantic import BaseModel
 from typing import List, Optional
 import datetime
+import os
+import re
 
-from langchain_chroma import Chroma
-from langchain_huggingface import HuggingFaceEmbeddings
-from transformers import AutoModelForCausalLM, AutoTokenizer, pipeline
-from langchain_huggingface import HuggingFacePipeline
 
-from utils.index_lectures import CHROMA_DB_PATH
+from utils.config import BM25_INDEX_PATH, CHROMA_DB_PATH, EMBEDDING_MODEL_NAME, NUMPY_STORE_PATH
+from utils.embeddings import LazyEmbeddings
+from utils.llm_service import LLMProfile, get_chat_llm
+from utils.pagination import keyset_page, page_limit, split_page
+from utils.semantic_cache import SemanticAnswerCache
+from utils.streaming import is_streaming_enabled, sse_event, stream_generation
 
 router = APIRouter()
 
@@ -25,6 +30,7 @@ class ChatRequest(BaseModel):
     user_id: int
     message: str
     one: bool = False
+    fused: bool = True  # One generation over all retrieved chunks instead of one per chunk
 
 
 class RelevantContentResponse(BaseModel):
@@ -52,20 +58,24 @@ class ChatResponse(BaseModel):
 
 
 @router.get("/{lecture_id}", response_model=List[ChatResponse])
-def get_chat_history(lecture_id: int, user_id: Optional[int] = None, db: Session = Depends(get_db)):
+def get_chat_history(lecture_id: int, response: Response, user_id: Optional[int] = None, cursor: Optional[str] = None,
+                     limit: int = page_limit(), db: Session = Depends(get_db)):
+    """
+    The latest `limit` messages, oldest first. X-Next-Cursor (if set) fetches the messages before them.
+    """
     query = db.query(ChatMessage).join(Chat).options(
-        joinedload(ChatMessage.relevant_content)
+        selectinload(ChatMessage.relevant_content)
     ).filter(Chat.lecture_id == lecture_id)
 
     if user_id:
         query = query.filter(Chat.user_id == user_id)
 
-    messages = query.order_by(ChatMessage.created_at).all()
+    messages, _ = split_page(keyset_page(query, ChatMessage, cursor, limit).all(), limit, response)
 
-    if not messages:
+    if not messages and not cursor:
         raise HTTPException(status_code=404, detail="No chat history found for this lecture")
 
-    return messages
+    return messages[::-1]
     # query = db.query(ChatMessage).join(Chat).filter(Chat.lecture_id == lecture_id)
     #
     # if user_id:
@@ -89,20 +99,56 @@ def get_chat_history(lecture_id: int, user_id: Optional[int] = None, db: Session
     # return messages
 
 
-@router.post("/", response_model=ChatResponse)
-def send_message(request: ChatRequest, db: Session = Depends(get_db)):
-    # Check if a conversation exists for this user and lecture
+def get_or_create_conversation(db: Session, lecture_id: int, user_id: int) -> Chat:
+    """Returns the user's conversation for a lecture, creating it on first use."""
     conversation = db.query(Chat).filter(
-        Chat.lecture_id == request.lecture_id,
-        Chat.user_id == request.user_id
+        Chat.lecture_id == lecture_id,
+        Chat.user_id == user_id
     ).first()
 
     if not conversation:
-        conversation = Chat(user_id=request.user_id, lecture_id=request.lecture_id)
+        conversation = Chat(user_id=user_id, lecture_id=lecture_id)
         db.add(conversation)
-        db.commit()
+        try:
+            db.commit()
+        except IntegrityError:
+            # A concurrent first message created it (unique user_id, lecture_id); use that one
+            db.rollback()
+            return db.query(Chat).filter(
+                Chat.lecture_id == lecture_id,
+                Chat.user_id == user_id
+            ).one()
         db.refresh(conversation)
 
+    return conversation
+
+
+def save_relevant_content(db: Session, chat_id: int, chat_message_id: int, user_id: int, results: list):
+    """Stores one RelevantContent row per retrieved transcript chunk."""
+    relevant_content_list = []
+    for result in results:
+        timestamp = int(float(result['timestamp']))
+        relevant_content = RelevantContent(
+            chat_id=chat_id,
+            chat_message_id=chat_message_id,
+            lecture_id=result['lecture_id'],
+            user_id=user_id,
+            content_type="Video",
+            title=f"Lecture {result['lecture_id']} - Relevant Segment",
+            description=result['text'][:150] + "...",
+            url=f"?t={timestamp}"
+        )
+        db.add(relevant_content)
+        relevant_content_list.append(relevant_content)
+
+    return relevant_content_list
+
+
+@router.post("/", response_model=ChatResponse)
+def send_message(request: ChatRequest, db: Session = Depends(get_db), llm: LLMProfile = Depends(get_chat_llm)):
+    # Check if a conversation exists for this user and lecture
+    conversation = get_or_create_conversation(db, request.lecture_id, request.user_id)
+
     try:
         # Store user message first
         user_message = ChatMessage(
@@ -113,11 +159,19 @@ def send_message(request: ChatRequest, db: Session = Depends(get_db)):
         db.add(user_message)
         db.flush()
 
+        # Near-duplicate questions on this lecture are answered from the semantic cache
+        scope = "lecture" if request.one else ("all-fused" if request.fused else "all")
+        ai_response_dict = semantic_cache.lookup(request.lecture_id, scope, request.message)
+
         # Get AI response using RAG
-        if request.one:
-            ai_response_dict = search_one_lecture(request.message, request.lecture_id)
-        else:
-            ai_response_dict = search_all_lectures(request.message)
+        if ai_response_dict is None:
+            if request.one:
+                ai_response_dict = search_one_lecture(request.message, request.lecture_id, llm)
+            else:
+                ai_response_dict = search_all_lectures(request.message, llm, fused=request.fused)
+
+            if ai_response_dict.get("results"):
+                semantic_cache.store(request.lecture_id, scope, request.message, ai_response_dict)
 
         # Store AI response
         ai_message = ChatMessage(
@@ -129,23 +183,9 @@ def send_message(request: ChatRequest, db: Session = Depends(get_db)):
         db.flush()
 
         # Store relevant content with references to both chat and message
-        relevant_content_list = []
-        if "results" in ai_response_dict and ai_response_dict["results"]:
-            results = ai_response_dict["results"]
-            for result in results:
-                timestamp = int(float(result['timestamp']))
-                relevant_content = RelevantContent(
-                    chat_id=conversation.id,
-                    chat_message_id=ai_message.id,
-                    lecture_id=result['lecture_id'],
-                    user_id=request.user_id,
-                    content_type="Video",
-                    title=f"Lecture {result['lecture_id']} - Relevant Segment",
-                    description=result['text'][:150] + "...",
-                    url=f"?t={timestamp}"
-                )
-                db.add(relevant_content)
-                relevant_content_list.append(relevant_content)
+        relevant_content_list = save_relevant_content(
+            db, conversation.id, ai_message.id, request.user_id, ai_response_dict.get("results") or []
+        )
 
         db.commit()
 
@@ -157,120 +197,228 @@ def send_message(request: ChatRequest, db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=str(e))
 
 
-# Initialize embeddings model
-model_name = "sentence-transformers/all-MiniLM-L6-v2"
-model_kwargs = {'device': 'cpu'}
-encode_kwargs = {'normalize_embeddings': False}
-embeddings = HuggingFaceEmbeddings(
-    model_name=model_name,
-    model_kwargs=model_kwargs,
-    encode_kwargs=encode_kwargs
-)
-
-# Initialize LLM
-llm_name = "mistralai/Mistral-7B-Instruct-v0.1"
-tokenizer = AutoTokenizer.from_pretrained(llm_name)
-model = AutoModelForCausalLM.from_pretrained(
-    llm_name,
-    torch_dtype="auto",
-    device_map="auto"
-)
-pipe = pipeline(
-    "text-generation",
-    model=model,
-    tokenizer=tokenizer,
-    max_new_tokens=256
-)
-llm = HuggingFacePipeline(pipeline=pipe)
-
-
-def search_one_lecture(message: str, lecture_id: int):
+@router.post("/stream")
+def stream_message(request: ChatRequest, db: Session = Depends(get_db), llm: LLMProfile = Depends(get_chat_llm)):
+    """
+    Same as `POST /chats/` but pushes generated tokens as Server-Sent Events.
+
+    Events: `results` (retrieved chunks), `token` (generated text, tagged with the chunk index; always 0 in fused mode),
+    `done` (the persisted AI ChatMessage) and `error`.
+    """
+    conversation = get_or_create_conversation(db, request.lecture_id, request.user_id)
+
+    user_message = ChatMessage(
+        chat_id=conversation.id,
+        sender="user",
+        message=request.message
+    )
+    db.add(user_message)
+    db.commit()
+
+    streaming = is_streaming_enabled(db)
+    chunks = retrieve_lecture_chunks(request.message, request.lecture_id if request.one else None,
+                                     k=1 if request.one else 5)
+    chat_id = conversation.id
+    fused = request.fused and not request.one
+
+    if fused:
+        fused_prompt, chunks = build_fused_prompt(chunks, request.message, llm)
+        # Nothing retrieved: no generation over an empty context, same reply as the per-chunk mode
+        prompts = [fused_prompt] if chunks else []
+    else:
+        prompts = [
+            build_lecture_prompt(chunk["lecture_id"], chunk["timestamp"], chunk["text"], request.message)
+            for chunk in chunks
+        ]
+
+    def event_stream():
+        yield sse_event("results", chunks)
+
+        answers = []
+        try:
+            for index, prompt in enumerate(prompts):
+                parts = []
+                for piece in stream_generation(llm, prompt, streaming, parts):
+                    yield sse_event("token", {"index": index, "text": piece})
+                answers.append("".join(parts).strip())
+        except Exception as e:
+            yield sse_event("error", {"detail": str(e)})
+            return
+
+        cited_chunks = cited_results(answers[0], chunks) if fused and answers else chunks
+
+        # The request-scoped session is closed once streaming starts, so persist with a fresh one
+        session = SessionLocal()
+        try:
+            ai_message = ChatMessage(
+                chat_id=chat_id,
+                sender="ai",
+                message="\n\n".join(answers) if answers else "⚠️ No relevant content found."
+            )
+            session.add(ai_message)
+            session.flush()
+            relevant_content_list = save_relevant_content(session, chat_id, ai_message.id, request.user_id,
+                                                          cited_chunks)
+            session.commit()
+
+            ai_message.relevant_content = relevant_content_list
+            yield sse_event("done", ChatResponse.model_validate(ai_message).model_dump(mode="json"))
+        except Exception as e:
+            session.rollback()
+            yield sse_event("error", {"detail": str(e)})
+        finally:
+            session.close()
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+
+# Initialize embeddings model (weights load on warmup or first query, not at import)
+embeddings = LazyEmbeddings(EMBEDDING_MODEL_NAME)
+
+# ✅ Chroma store opened once per process and reused by every chat turn
+# RETRIEVAL_BACKEND=numpy serves vector queries from the memory-mapped exact-search export instead
+RETRIEVAL_BACKEND = os.getenv("RETRIEVAL_BACKEND", "chroma")
+vector_store = VectorStoreManager(CHROMA_DB_PATH, embeddings, lexical_index_path=BM25_INDEX_PATH,
+                                  backend=RETRIEVAL_BACKEND, numpy_store_path=NUMPY_STORE_PATH)
+
+# Answers to earlier questions, looked up by question embedding
+semantic_cache = SemanticAnswerCache(embeddings.embed_query)
+
+
+def build_lecture_prompt(lecture_id: int, timestamp, text: str, question: str) -> str:
+    """Formats a transcript chunk and the student's question for the LLM."""
+    return f"""
+        Lecture {lecture_id}, segment at {timestamp}s:
+        {text}
+
+        Question: {question}
+        Answer:"""
+
+
+def retrieve_lecture_chunks(query: str, lecture_id: Optional[int] = None, k: int = 5) -> list:
+    """
+    Hybrid (BM25 + vector) search over the indexed transcripts, optionally restricted to one lecture.
+    """
+    search_filter = {"lecture_id": lecture_id} if lecture_id is not None else None
+    results = vector_store.hybrid_search(query, k=k, filter=search_filter)
+
+    return [
+        {
+            "lecture_id": doc.metadata["lecture_id"],
+            "timestamp": doc.metadata["start_time"],
+            "youtube_url": doc.metadata["youtube_url"],
+            "text": doc.page_content
+        }
+        for doc in results
+    ]
+
+
+def search_one_lecture(message: str, lecture_id: int, llm: LLMProfile):
     """
     Retrieves relevant content from a specific lecture and generates an AI response using RAG.
     """
     print(f"📌 Searching **Lecture {lecture_id}** for relevant content...")
 
     try:
-        # ✅ Load Chroma vector store
-        vectorstore = Chroma(persist_directory=CHROMA_DB_PATH, embedding_function=embeddings)
-
         # ✅ Retrieve relevant documents **only for this lecture**
-        results = vectorstore.similarity_search(
-            message, k=1, filter={"lecture_id": lecture_id}
-        )
+        results = retrieve_lecture_chunks(message, lecture_id, k=1)
 
         if not results:
             return {"message": "⚠️ No relevant content found in this lecture."}
 
-        # ✅ Extract metadata & transcript
-        best_match = results[0].metadata
-        timestamp = best_match["start_time"]
-        youtube_url = best_match["youtube_url"]
-        lecture_text = results[0].page_content
-
         # ✅ Format query for LLM
-        context = f"""
-        Lecture {lecture_id}, segment at {timestamp}s:
-        {lecture_text}
-
-        Question: {message}
-        Answer:"""
+        best_match = results[0]
+        context = build_lecture_prompt(lecture_id, best_match["timestamp"], best_match["text"], message)
 
         response = llm.invoke(context)
 
         return {
             "message": "🔍 **Found Relevant Content:**",
-            "results": [{
-                "lecture_id": lecture_id,
-                "timestamp": timestamp,
-                "youtube_url": youtube_url,
-                "text": lecture_text,
-                "ai_response": response.strip()
-            }]
+            "results": [{**best_match, "ai_response": response.strip()}]
         }
 
     except Exception as e:
         return {"message": f"❌ An error occurred: {str(e)}"}
 
 
-def search_all_lectures(query: str, k: int = 5):
+# Token budget for the transcript context packed into a fused prompt
+FUSED_CONTEXT_TOKENS = 1536
+
+
+def build_fused_prompt(chunks: list, question: str, llm: LLMProfile, max_context_tokens: int = FUSED_CONTEXT_TOKENS):
     """
-    Searches across all indexed lectures for the most relevant transcript chunks.
+    Packs the retrieved chunks (best first) into one numbered context until the token budget
+    is spent. Returns the prompt and the chunks that made it in, tagged with their citation number.
     """
-    vectorstore = Chroma(persist_directory=CHROMA_DB_PATH, embedding_function=embeddings)
+    sources = []
+    packed = []
+    used_tokens = 0
+
+    for chunk in chunks:
+        citation = len(packed) + 1
+        source = f"[{citation}] Lecture {chunk['lecture_id']}, segment at {chunk['timestamp']}s:\n{chunk['text'].strip()}"
+        source_tokens = llm.count_tokens(source)
+        if packed and used_tokens + source_tokens > max_context_tokens:
+            break
+
+        sources.append(source)
+        packed.append({**chunk, "citation": citation})
+        used_tokens += source_tokens
+
+    context = "\n\n".join(sources)
+    prompt = f"""
+        Answer the question using only the numbered lecture segments below.
+        Cite the segments you use with their numbers in square brackets, e.g. [1] or [2][3].
+
+        {context}
+
+        Question: {question}
+        Answer:"""
+
+    return prompt, packed
+
 
+def cited_results(answer: str, chunks: list) -> list:
+    """Chunks referenced as [n] in the answer; every packed chunk if the model cited none."""
+    cited = {int(n) for n in re.findall(r"\[(\d+)\]", answer)}
+    results = [chunk for chunk in chunks if chunk["citation"] in cited]
+    return results or chunks
+
+
+def search_all_lectures(query: str, llm: LLMProfile, k: int = 5, fused: bool = True):
+    """
+    Searches across all indexed lectures for the most relevant transcript chunks.
+
+    In fused mode the top-k chunks are answered by a single generation with citations,
+    instead of one generation per chunk.
+    """
     # ✅ Perform similarity search across all lectures
-    results = vectorstore.similarity_search(query, k=k)
+    results = retrieve_lecture_chunks(query, k=k)
 
     if not results:
         return {"message": "⚠️ No relevant content found across all lectures."}
 
+    if fused:
+        context, packed = build_fused_prompt(results, query, llm)
+        response = llm.invoke(context)
+        # The pipeline echoes the prompt; keep only the generated answer
+        answer = response[len(context):] if response.startswith(context) else response
+        answer = answer.strip()
+
+        return {
+            "message": answer,
+            "results": [{**chunk, "ai_response": answer} for chunk in cited_results(answer, packed)]
+        }
+
     response_list = []
 
-    for doc in results:
-        metadata = doc.metadata
-        lecture_id = metadata["lecture_id"]
-        youtube_url = metadata["youtube_url"]
-        timestamp = metadata["start_time"]
-        # text = metadata["text"]
-        text = doc.page_content
+    for chunk in results:
         # ✅ Format query for LLM
-        context = f"""
-        Lecture {lecture_id}, segment at {timestamp}s:
-        {text}
-
-        Question: {query}
-        Answer:"""
+        context = build_lecture_prompt(chunk["lecture_id"], chunk["timestamp"], chunk["text"], query)
 
         response = llm.invoke(context)
 
-        response_list.append({
-            "lecture_id": lecture_id,
-            "timestamp": timestamp,
-            "youtube_url": youtube_url,
-            "text": text,
-            "ai_response": response.strip()
-        })
+        response_list.append({**chunk, "ai_response": response.strip()})
 
     return {
         "message": "🔍 **Found Relevant Content:**",
@@ -280,10 +428,12 @@ def search_all_lectures(query: str, k: int = 5):
 
 # Add a new endpoint to get relevant content by chat
 @router.get("/chat/{chat_id}/relevant-content")
-def get_chat_relevant_content(chat_id: int, db: Session = Depends(get_db)):
-    return db.query(RelevantContent).filter(
-        RelevantContent.chat_id == chat_id
-    ).order_by(RelevantContent.created_at.desc()).all()
+def get_chat_relevant_content(chat_id: int, response: Response, cursor: Optional[str] = None,
+                              limit: int = page_limit(), db: Session = Depends(get_db)):
+    """Newest first; X-Next-Cursor (if set) fetches the next page."""
+    query = db.query(RelevantContent).filter(RelevantContent.chat_id == chat_id)
+    content, _ = split_page(keyset_page(query, RelevantContent, cursor, limit).all(), limit, response)
+    return content
 
 
 # Update the latest relevant content endpoint
@@ -1,7 +1,8 @@
 import time
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Response, UploadFile, File
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session, selectinload
 from sqlalchemy import and_
 from typing import List, Optional, Dict, Any
 from pydantic import BaseModel
@@ -11,12 +12,13 @@ import tempfile
 import shutil
 import requests
 
-from database.database import get_db
+from database.database import SessionLocal, get_db
 from models import CodeExercise, TestCase, CodeSubmission, CodeChat, CodeChatMessage
 
-# Import AI-related libraries for code generation and analysis
-from transformers import AutoModelForCausalLM, AutoTokenizer, pipeline
-from langchain_huggingface import HuggingFacePipeline
+# Shared AI model for code generation and analysis
+from utils.llm_service import LLMProfile, get_code_llm
+from utils.pagination import keyset_page, page_limit, split_page
+from utils.streaming import is_streaming_enabled, sse_event, stream_generation
 
 from models.code_exercises import CodeSearchResult
 
@@ -142,24 +144,6 @@ class TestCaseGenerationResponse(BaseModel):
     test_cases: List[TestCaseBase]
 
 
-# Initialize AI model for code generation and analysis
-# Note: In a production environment, you would want to load these models more efficiently
-model_name = "mistralai/Mistral-7B-Instruct-v0.1"  # You can use a more code-specific model
-tokenizer = AutoTokenizer.from_pretrained(model_name)
-model = AutoModelForCausalLM.from_pretrained(
-    model_name,
-    torch_dtype="auto",
-    device_map="auto"
-)
-pipe = pipeline(
-    "text-generation",
-    model=model,
-    tokenizer=tokenizer,
-    max_new_tokens=512
-)
-llm = HuggingFacePipeline(pipeline=pipe)
-
-
 # Add new model for search request
 
 # API Routes
@@ -243,7 +227,8 @@ def update_code_exercise(exercise_id: int, exercise: CodeExerciseBase, db: Sessi
 
 
 @router.post("/{exercise_id}/test-cases", response_model=TestCaseGenerationResponse)
-def generate_test_cases(request: TestCaseGenerationRequest, db: Session = Depends(get_db)):
+def generate_test_cases(request: TestCaseGenerationRequest, db: Session = Depends(get_db),
+                        llm: LLMProfile = Depends(get_code_llm)):
     """Generate test cases for a coding exercise using AI."""
     # Get the exercise
     exercise = db.query(CodeExercise).filter(CodeExercise.id == request.code_exercise_id).first()
@@ -425,7 +410,8 @@ def get_submission(exercise_id: int, db: Session = Depends(get_db)):
 
 
 @router.post("/{exercise_id}/submissions", response_model=CodeSubmissionResponse)
-def submit_code(submission: CodeSubmissionCreate, db: Session = Depends(get_db)):
+def submit_code(submission: CodeSubmissionCreate, db: Session = Depends(get_db),
+                llm: LLMProfile = Depends(get_code_llm)):
     """Submit code for a coding exercise."""
     # Check if the exercise exists
     exercise = db.query(CodeExercise).filter(CodeExercise.id == submission.code_exercise_id).first()
@@ -588,16 +574,19 @@ def get_submission(submission_id: int, db: Session = Depends(get_db)):
 @router.get("/{exercise_id}/submissions/user/{user_id}", response_model=List[CodeSubmissionResponse])
 def get_user_submissions(
         user_id: int,
+        response: Response,
         exercise_id: Optional[int] = None,
+        cursor: Optional[str] = None,
+        limit: int = page_limit(),
         db: Session = Depends(get_db)
 ):
-    """Get all submissions for a specific user."""
+    """Get a user's submissions, newest first; X-Next-Cursor (if set) fetches the next page."""
     query = db.query(CodeSubmission).filter(CodeSubmission.user_id == user_id)
 
     if exercise_id:
         query = query.filter(CodeSubmission.code_exercise_id == exercise_id)
 
-    submissions = query.order_by(CodeSubmission.created_at.desc()).all()
+    submissions, _ = split_page(keyset_page(query, CodeSubmission, cursor, limit).all(), limit, response)
     return submissions
 
 
@@ -637,11 +626,91 @@ def get_code_chat(chat_id: int, db: Session = Depends(get_db)):
     return chat
 
 
+def build_code_chat_prompt(db: Session, chat: CodeChat, message: CodeChatMessageCreate, message_id: int) -> str:
+    """Builds the tutor prompt from the exercise, the linked submission and recent history."""
+    # Get context for the AI response
+    exercise = None
+    submission = None
+
+    if chat.code_exercise_id:
+        exercise = db.query(CodeExercise).filter(CodeExercise.id == chat.code_exercise_id).first()
+
+    if chat.code_submission_id:
+        submission = db.query(CodeSubmission).filter(CodeSubmission.id == chat.code_submission_id).first()
+
+    # Get previous messages for context (only user messages and AI responses)
+    previous_messages = db.query(CodeChatMessage).filter(
+        and_(
+            CodeChatMessage.code_chat_id == chat.id,
+            CodeChatMessage.id != message_id
+        )
+    ).order_by(CodeChatMessage.created_at).all()
+
+    # Prepare prompt for AI
+    prompt = "You are an expert programming tutor helping a student with their code. Provide clear, concise responses focused on helping them understand and improve their code. Do not mention that you are an AI or reference the conversation history. Just respond naturally as a tutor would.\n\n"
+
+    if exercise:
+        prompt += f"Context - Problem: {exercise.title}\n{exercise.description}\n\n"
+
+    if submission:
+        prompt += f"Context - Student's Code:\n```\n{submission.code}\n```\n\n"
+
+        if submission.results:
+            prompt += f"Context - Test Results: {submission.results['passed']} tests passed, {submission.results['failed']} tests failed.\n\n"
+
+    # Add conversation history for context
+    prompt += "Previous conversation:\n"
+    for prev_msg in previous_messages[-5:]:  # Only use last 5 messages
+        role = "Student" if prev_msg.sender == "user" else "Tutor"
+        prompt += f"{role}: {prev_msg.message}\n"
+        if prev_msg.code_snippet:
+            prompt += f"Code:\n```\n{prev_msg.code_snippet}\n```\n"
+
+    prompt += f"\nStudent: {message.message}\n"
+    if message.code_snippet:
+        prompt += f"Code:\n```\n{message.code_snippet}\n```\n"
+
+    prompt += "\nProvide your response as a tutor:"
+    return prompt
+
+
+def clean_ai_response(response: str) -> tuple[str, str | None]:
+    # Remove any mentions of being an AI, system prompts, or conversation history
+    response = response.replace("As an AI", "As a tutor")
+    response = response.replace("As an expert programming tutor", "")
+
+    # Extract code snippets
+    code_snippet = None
+    message_text = response
+
+    # Look for code blocks
+    if "```" in response:
+        parts = response.split("```")
+        message_parts = []
+        for i, part in enumerate(parts):
+            if i % 2 == 0:  # Not a code block
+                message_parts.append(part.strip())
+            else:  # Code block
+                if not code_snippet:  # Take the first code block
+                    code_snippet = part.strip()
+                    if code_snippet.startswith("python"):
+                        code_snippet = code_snippet[6:].strip()
+        message_text = " ".join(part for part in message_parts if part)
+
+    # Clean up the message
+    message_text = message_text.strip()
+    if message_text.startswith("Tutor:"):
+        message_text = message_text[6:].strip()
+
+    return message_text, code_snippet
+
+
 @router.post("/chat/{chat_id}/messages", response_model=CodeChatMessageResponse)
 def add_chat_message(
         chat_id: int,
         message: CodeChatMessageCreate,
-        db: Session = Depends(get_db)
+        db: Session = Depends(get_db),
+        llm: LLMProfile = Depends(get_code_llm)
 ):
     """Add a message to a code chat."""
     # Check if chat exists
@@ -661,83 +730,10 @@ def add_chat_message(
 
     # If this is a user message, generate an AI response
     if message.sender == "user":
-        # Get context for the AI response
-        exercise = None
-        submission = None
-
-        if chat.code_exercise_id:
-            exercise = db.query(CodeExercise).filter(CodeExercise.id == chat.code_exercise_id).first()
+        prompt = build_code_chat_prompt(db, chat, message, db_message.id)
 
-        if chat.code_submission_id:
-            submission = db.query(CodeSubmission).filter(CodeSubmission.id == chat.code_submission_id).first()
-
-        # Get previous messages for context (only user messages and AI responses)
-        previous_messages = db.query(CodeChatMessage).filter(
-            and_(
-                CodeChatMessage.code_chat_id == chat_id,
-                CodeChatMessage.id != db_message.id
-            )
-        ).order_by(CodeChatMessage.created_at).all()
-
-        # Prepare prompt for AI
-        prompt = "You are an expert programming tutor helping a student with their code. Provide clear, concise responses focused on helping them understand and improve their code. Do not mention that you are an AI or reference the conversation history. Just respond naturally as a tutor would.\n\n"
-
-        if exercise:
-            prompt += f"Context - Problem: {exercise.title}\n{exercise.description}\n\n"
-
-        if submission:
-            prompt += f"Context - Student's Code:\n```\n{submission.code}\n```\n\n"
-
-            if submission.results:
-                prompt += f"Context - Test Results: {submission.results['passed']} tests passed, {submission.results['failed']} tests failed.\n\n"
-
-        # Add conversation history for context
-        prompt += "Previous conversation:\n"
-        for prev_msg in previous_messages[-5:]:  # Only use last 5 messages
-            role = "Student" if prev_msg.sender == "user" else "Tutor"
-            prompt += f"{role}: {prev_msg.message}\n"
-            if prev_msg.code_snippet:
-                prompt += f"Code:\n```\n{prev_msg.code_snippet}\n```\n"
-
-        prompt += f"\nStudent: {message.message}\n"
-        if message.code_snippet:
-            prompt += f"Code:\n```\n{message.code_snippet}\n```\n"
-
-        prompt += "\nProvide your response as a tutor:"
-
-        # Generate AI response
-        ai_response = llm.invoke(prompt)
-
-        # Clean the response
-        def clean_ai_response(response: str) -> tuple[str, str | None]:
-            # Remove any mentions of being an AI, system prompts, or conversation history
-            response = response.replace("As an AI", "As a tutor")
-            response = response.replace("As an expert programming tutor", "")
-
-            # Extract code snippets
-            code_snippet = None
-            message_text = response
-
-            # Look for code blocks
-            if "```" in response:
-                parts = response.split("```")
-                message_parts = []
-                for i, part in enumerate(parts):
-                    if i % 2 == 0:  # Not a code block
-                        message_parts.append(part.strip())
-                    else:  # Code block
-                        if not code_snippet:  # Take the first code block
-                            code_snippet = part.strip()
-                            if code_snippet.startswith("python"):
-                                code_snippet = code_snippet[6:].strip()
-                message_text = " ".join(part for part in message_parts if part)
-
-            # Clean up the message
-            message_text = message_text.strip()
-            if message_text.startswith("Tutor:"):
-                message_text = message_text[6:].strip()
-
-            return message_text, code_snippet
+        # Generate AI response (conversational, so never served from the response cache)
+        ai_response = llm.invoke(prompt, cache=False)
 
         # Clean the AI response
         message_text, code_snippet = clean_ai_response(ai_response)
@@ -756,19 +752,93 @@ def add_chat_message(
     return db_message
 
 
+@router.post("/chat/{chat_id}/messages/stream")
+def stream_chat_message(
+        chat_id: int,
+        message: CodeChatMessageCreate,
+        db: Session = Depends(get_db),
+        llm: LLMProfile = Depends(get_code_llm)
+):
+    """
+    Streaming variant of `add_chat_message`: tutor tokens are pushed as Server-Sent Events
+    and the cleaned AI CodeChatMessage is stored once generation completes.
+
+    Events: `message` (the stored student message), `token`, `done` (the stored AI message) and `error`.
+    """
+    chat = db.query(CodeChat).filter(CodeChat.id == chat_id).first()
+    if not chat:
+        raise HTTPException(status_code=404, detail="Chat not found")
+    if message.sender != "user":
+        raise HTTPException(status_code=400, detail="Only user messages can be streamed")
+
+    db_message = CodeChatMessage(
+        code_chat_id=chat_id,
+        sender=message.sender,
+        message=message.message,
+        code_snippet=message.code_snippet
+    )
+    db.add(db_message)
+    db.flush()
+
+    prompt = build_code_chat_prompt(db, chat, message, db_message.id)
+    db.commit()
+    db.refresh(db_message)
+
+    streaming = is_streaming_enabled(db)
+    stored_message = CodeChatMessageResponse.model_validate(db_message).model_dump(mode="json")
+
+    def event_stream():
+        yield sse_event("message", stored_message)
+
+        parts = []
+        try:
+            for piece in stream_generation(llm, prompt, streaming, parts):
+                yield sse_event("token", {"text": piece})
+        except Exception as e:
+            yield sse_event("error", {"detail": str(e)})
+            return
+
+        message_text, code_snippet = clean_ai_response("".join(parts))
+
+        # The request-scoped session is closed once streaming starts, so persist with a fresh one
+        session = SessionLocal()
+        try:
+            ai_message = CodeChatMessage(
+                code_chat_id=chat_id,
+                sender="ai",
+                message=message_text,
+                code_snippet=code_snippet
+            )
+            session.add(ai_message)
+            session.commit()
+            session.refresh(ai_message)
+            yield sse_event("done", CodeChatMessageResponse.model_validate(ai_message).model_dump(mode="json"))
+        except Exception as e:
+            session.rollback()
+            yield sse_event("error", {"detail": str(e)})
+        finally:
+            session.close()
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+
 @router.get("/chat/user/{user_id}", response_model=List[CodeChatResponse])
 def get_user_chats(
         user_id: int,
+        response: Response,
         exercise_id: Optional[int] = None,
+        cursor: Optional[str] = None,
+        limit: int = page_limit(20),
         db: Session = Depends(get_db)
 ):
-    """Get all code chats for a specific user."""
-    query = db.query(CodeChat).filter(CodeChat.user_id == user_id)
+    """Get a user's code chats, newest first; X-Next-Cursor (if set) fetches the next page."""
+    # Messages for the whole page in one extra query instead of one lazy load per chat
+    query = db.query(CodeChat).options(selectinload(CodeChat.messages)).filter(CodeChat.user_id == user_id)
 
     if exercise_id:
         query = query.filter(CodeChat.code_exercise_id == exercise_id)
 
-    chats = query.order_by(CodeChat.created_at.desc()).all()
+    chats, _ = split_page(keyset_page(query, CodeChat, cursor, limit).all(), limit, response)
     return chats
 
 
@@ -855,7 +925,8 @@ class BoilerplateResponse(BaseModel):
 
 
 @router.post("/{exercise_id}/generate-boilerplate", response_model=BoilerplateResponse)
-def generate_boilerplate(request: BoilerplateRequest, db: Session = Depends(get_db)):
+def generate_boilerplate(request: BoilerplateRequest, db: Session = Depends(get_db),
+                         llm: LLMProfile = Depends(get_code_llm)):
     """Generate boilerplate code based on the question and selected language."""
 
     ex = db.query(CodeExercise).filter(CodeExercise.id == request.exercise_id).first()
@@ -1054,7 +1125,8 @@ async def search_content(exercise_id: int, request: SearchRequest, db: Session =
 
 
 @router.post("/run-tests", response_model=dict)
-def run_tests(data: dict, db: Session = Depends(get_db)):
+def run_tests(data: dict, db: Session = Depends(get_db),
+              llm: LLMProfile = Depends(get_code_llm)):
     """Run multiple test cases against the provided code."""
     try:
         code = data.get("code")
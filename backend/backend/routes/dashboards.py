@@ -1,14 +1,14 @@
 from fastapi import APIRouter, Depends, UploadFile, File, HTTPException
-from sqlalchemy.orm import Session
-from sqlalchemy import func, desc, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, desc, select
 import re
 from collections import Counter
 
-from database.database import get_db
+from database.database import get_async_db
 from utils.auth import get_current_user
-from models import Quiz, Week, Lecture, Chat, ChatMessage, CodeChat, CodeChatMessage
+from utils.course_tree import load_course_tree
+from models import Chat, ChatMessage, CodeChat, CodeChatMessage
 from models import User
-from datetime import datetime, timedelta
 
 router = APIRouter()
 
@@ -74,42 +74,41 @@ def extract_topics_from_text(text):
     
     return matching_topics
 
-def analyze_chat_messages(db: Session, week_id: int = None):
-    """Analyze chat messages to extract common searches and topics"""
-    # If week_id is provided, get all lectures in that week
-    if week_id:
-        lectures = db.query(Lecture).filter(Lecture.week_id == week_id).all()
-        lecture_ids = [lecture.id for lecture in lectures]
-        lecture_map = {lecture.id: lecture.name for lecture in lectures}
-        
-        if not lecture_ids:
-            return []  # No lectures in this week
-    else:
-        # If no week_id, get all lectures
-        lectures = db.query(Lecture).all()
-        lecture_ids = [lecture.id for lecture in lectures]
-        lecture_map = {lecture.id: lecture.name for lecture in lectures}
-    
+async def load_chat_search_counts(db: AsyncSession):
+    """
+    User chat questions grouped by (message, lecture), plus the top code chat questions.
+    Two queries for the whole course; analyze_chat_messages then slices them per week.
+    """
     # Base query to get user messages with lecture context
-    chat_query = db.query(
+    chat_query = select(
         ChatMessage.message, 
         Chat.lecture_id,
         func.count(ChatMessage.id).label("count")
-    ).join(Chat).filter(ChatMessage.sender == "user")
-    
-    # If we have lecture_ids, filter by them
-    if week_id and lecture_ids:
-        chat_query = chat_query.filter(Chat.lecture_id.in_(lecture_ids))
+    ).join(Chat).where(ChatMessage.sender == "user")
     
     # Get chat messages grouped by both message text and lecture
-    chat_messages = chat_query.group_by(ChatMessage.message, Chat.lecture_id).order_by(desc("count")).all()
+    chat_messages = (await db.execute(
+        chat_query.group_by(ChatMessage.message, Chat.lecture_id).order_by(desc("count"))
+    )).all()
     
     # Also get code chat messages (not filtered by lecture since they're not tied to lectures)
-    code_query = db.query(CodeChatMessage.message, func.count(CodeChatMessage.id).label("count")) \
-                   .filter(CodeChatMessage.sender == "user")
+    code_query = select(CodeChatMessage.message, func.count(CodeChatMessage.id).label("count")) \
+                   .where(CodeChatMessage.sender == "user")
     
     # Execute code chat query
-    code_messages = code_query.group_by(CodeChatMessage.message).order_by(desc("count")).limit(30).all()
+    code_messages = (await db.execute(
+        code_query.group_by(CodeChatMessage.message).order_by(desc("count")).limit(30)
+    )).all()
+    return chat_messages, code_messages
+
+
+def analyze_chat_messages(chat_counts, lecture_map: dict):
+    """Analyze chat messages about the given lectures ({id: name}) to extract common searches and topics"""
+    if not lecture_map:
+        return []  # No lectures in this week
+
+    all_chat_messages, code_messages = chat_counts
+    chat_messages = [row for row in all_chat_messages if row[1] in lecture_map]
     
     # Combine results - store lecture context for regular chats
     message_data = {}
@@ -179,26 +178,24 @@ def analyze_chat_messages(db: Session, week_id: int = None):
     return results[:20]
 
 @router.get("/student_dashboard", summary="Get Dashboard Data")
-def get_dashboard(db: Session = Depends(get_db),
+async def get_dashboard(db: AsyncSession = Depends(get_async_db),
                   currentUser=Depends(get_current_user)):
     """
     Returns dashboard data including latest quiz data from the database.
     """
     # Get user details
-    user = db.query(User).filter(User.id == currentUser).first()
+    user = await db.get(User, int(currentUser))
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
+    # Weeks, lectures and quizzes in a fixed number of round-trips, whatever the course size
+    tree = await load_course_tree(db)
+
     # Get latest quizzes (last 7 days)
-    latest_quizzes = db.query(Quiz).filter(
-        and_(
-            Quiz.date <= datetime.now(),
-            Quiz.date >= datetime.now() - timedelta(days=7)
-        )
-    ).order_by(Quiz.date.desc()).all()
+    latest_quizzes = tree.latest_quizzes(days=7)
 
     # Get all quizzes for the study plan section
-    all_quizzes = db.query(Quiz).order_by(Quiz.date.desc()).all()
+    all_quizzes = tree.quizzes
     
     # Format quizzes for the study plan dropdown
     quizzes_list = [
@@ -213,12 +210,12 @@ def get_dashboard(db: Session = Depends(get_db),
     ]
     
     # Get all weeks and their lectures
-    all_weeks = db.query(Week).order_by(Week.id).all()
+    all_weeks = tree.weeks
     
     # Create a dictionary of weeks with their lectures
     weeks_data = {}
     for week in all_weeks:
-        lectures = db.query(Lecture).filter(Lecture.week_id == week.id).order_by(Lecture.sequence_no).all()
+        lectures = tree.lectures_for_week(week.id)
         
         weeks_data[week.id] = {
             "id": week.id,
@@ -294,9 +291,10 @@ def get_dashboard(db: Session = Depends(get_db),
 
 
 @router.get("/teacher_dashboard")
-def get_teacher_dashboard(week_id: int = None, db: Session = Depends(get_db)):
+async def get_teacher_dashboard(week_id: int = None, db: AsyncSession = Depends(get_async_db)):
     # Fetch actual weeks from the database
-    db_weeks = db.query(Week).order_by(Week.id).all()
+    tree = await load_course_tree(db)
+    db_weeks = tree.weeks
     
     if not db_weeks:
         # If no weeks in database, use default hardcoded data
@@ -314,6 +312,9 @@ def get_teacher_dashboard(week_id: int = None, db: Session = Depends(get_db)):
     
     print(f"Available weeks from database: {available_weeks}")
     
+    # Chat questions for every week at once, sliced per week below
+    chat_counts = await load_chat_search_counts(db)
+
     # Default data for all weeks with explicit number values
     all_weeks_data = {}
     
@@ -323,11 +324,11 @@ def get_teacher_dashboard(week_id: int = None, db: Session = Depends(get_db)):
         week_id_num = week.id
         
         # Get lectures for this week
-        lectures = db.query(Lecture).filter(Lecture.week_id == week_id_num).order_by(Lecture.sequence_no).all()
+        lectures = tree.lectures_for_week(week_id_num)
         lecture_names = [lecture.name for lecture in lectures]
         
         # Get real common searches for this week from chat messages
-        week_searches = analyze_chat_messages(db, week_id_num)
+        week_searches = analyze_chat_messages(chat_counts, {lecture.id: lecture.name for lecture in lectures})
         
         # NO mock data - if no real data, just return empty array
         if not week_searches:
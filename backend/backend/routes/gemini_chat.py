@@ -1,12 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 from typing import Optional, Dict, List
 import os
 from google import genai
 import random
 
-from database.database import get_db
+from database.database import get_async_db
 from utils.auth import get_current_user
 
 # Set up Google API key - ensure this is set in your environment variables
@@ -58,7 +58,7 @@ class GeminiChatResponse(BaseModel):
 async def chat_with_gemini(
         request: GeminiChatRequest,
         currentUser=Depends(get_current_user),
-        db: Session = Depends(get_db)
+        db: AsyncSession = Depends(get_async_db)
 ):
     """
     Process a chat request to the Gemini API and return a response.
@@ -1,13 +1,18 @@
+from datetime import datetime
 from typing import Optional, Dict, Any, List
 
-from fastapi import APIRouter, Depends, HTTPException
-from pydantic import BaseModel, HttpUrl
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_, or_
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from pydantic import BaseModel, HttpUrl, TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from sqlalchemy import and_, or_, select
 
-from database.database import get_db
-from models import Lecture, ChatMessage, Chat, RelevantContent, StudySearchResult
+from database.database import get_async_db
+from models import Lecture, ChatMessage, Chat, RelevantContent, StudySearchResult, IndexJob
 from routes.chats import ChatResponse
+from utils.catalog_cache import catalog_cache, catalog_response
+from utils.index_jobs import enqueue_index_job
+from utils.pagination import keyset_page, page_limit, split_page
 from .relevant_content import search_study_content
 
 router = APIRouter()
@@ -45,23 +50,45 @@ class LectureResponse(LectureRequest):
         from_attributes = True
 
 
-@router.get("/", response_model=List[LectureResponse])
-def get_lectures(week_id: Optional[int] = None, db: Session = Depends(get_db)):
-    query = db.query(Lecture)
+LECTURE_LIST_ADAPTER = TypeAdapter(List[LectureResponse])
+
 
-    if week_id:
-        query = query.filter(Lecture.week_id == week_id)
+class IndexJobRequest(BaseModel):
+    reindex: bool = False  # Re-transcribe even if the lecture is already indexed
 
-    lectures = query.order_by(Lecture.week_id, Lecture.sequence_no).all()
+
+class IndexJobResponse(BaseModel):
+    id: int
+    lecture_id: int
+    status: str
+    stage: str
+    progress: float
+    reindex: bool
+    error: Optional[str] = None
+    attempts: int
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    duration_seconds: Optional[float] = None
+
+    class Config:
+        from_attributes = True
+
+
+@router.get("/", response_model=List[LectureResponse])
+async def get_lectures(request: Request, week_id: Optional[int] = None, db: AsyncSession = Depends(get_async_db)):
+    catalog = await catalog_cache.get(db)
+    lectures = catalog.lectures_for_week(week_id) if week_id else catalog.lectures
 
     if not lectures:
         raise HTTPException(status_code=404, detail="No lectures found")
 
-    return [LectureResponse.from_orm(lecture) for lecture in lectures]
+    return catalog_response(request, catalog, ("lectures", week_id), LECTURE_LIST_ADAPTER,
+                            lambda: [lecture._asdict() for lecture in lectures])
 
 
 @router.post("/", response_model=LectureResponse)
-def create_lecture(request: LectureRequest, db: Session = Depends(get_db)):
+async def create_lecture(request: LectureRequest, db: AsyncSession = Depends(get_async_db)):
     new_lecture = Lecture(
         week_id=request.week_id,
         sequence_no=request.sequence_no,
@@ -72,24 +99,60 @@ def create_lecture(request: LectureRequest, db: Session = Depends(get_db)):
     )
 
     db.add(new_lecture)
-    db.commit()
-    db.refresh(new_lecture)
+    await db.flush()
+
+    # ✅ Video lectures are indexed in the background by utils/index_worker.py
+    if new_lecture.type == "Video" and new_lecture.url:
+        await enqueue_index_job(db, new_lecture.id)
+
+    await db.commit()
+    await db.refresh(new_lecture)
+    catalog_cache.invalidate()
 
     return new_lecture
 
 
+@router.post("/{lecture_id}/index", response_model=IndexJobResponse, status_code=202)
+async def index_lecture(lecture_id: int, request: Optional[IndexJobRequest] = None, db: AsyncSession = Depends(get_async_db)):
+    lecture = await db.get(Lecture, lecture_id)
+    if not lecture:
+        raise HTTPException(status_code=404, detail="Lecture not found")
+    if lecture.type != "Video" or not lecture.url:
+        raise HTTPException(status_code=400, detail="Only video lectures with a URL can be indexed")
+
+    job = await enqueue_index_job(db, lecture_id, reindex=request.reindex if request else False)
+    await db.commit()
+    await db.refresh(job)
+    return job
+
+
+@router.get("/index-jobs/{job_id}", response_model=IndexJobResponse)
+async def get_index_job(job_id: int, db: AsyncSession = Depends(get_async_db)):
+    job = await db.get(IndexJob, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Index job not found")
+    return job
+
+
 @router.get("/{lecture_id}/chats", response_model=List[ChatResponse])
-def get_chat_history_for_lecture(lecture_id: int, user_id: Optional[int] = None, db: Session = Depends(get_db)):
-    query = db.query(ChatMessage).join(Chat).options(
-        joinedload(ChatMessage.relevant_content)
-    ).filter(Chat.lecture_id == lecture_id)
+async def get_chat_history_for_lecture(lecture_id: int, response: Response, user_id: Optional[int] = None,
+                                       cursor: Optional[str] = None, limit: int = page_limit(),
+                                       db: AsyncSession = Depends(get_async_db)):
+    """
+    The latest `limit` messages, oldest first. X-Next-Cursor (if set) fetches the messages before them.
+    """
+    # selectinload, not joinedload: an AsyncSession can't lazy-load relationships during serialization
+    query = select(ChatMessage).join(Chat).options(
+        selectinload(ChatMessage.relevant_content)
+    ).where(Chat.lecture_id == lecture_id)
 
     if user_id:
-        query = query.filter(Chat.user_id == user_id)
+        query = query.where(Chat.user_id == user_id)
 
-    messages = query.order_by(ChatMessage.created_at).all()
+    result = await db.execute(keyset_page(query, ChatMessage, cursor, limit))
+    messages, _ = split_page(result.scalars().all(), limit, response)
 
-    if not messages:
+    if not messages and not cursor:
         raise HTTPException(status_code=404, detail="No chat history found for this lecture")
 
-    return messages
+    return messages[::-1]
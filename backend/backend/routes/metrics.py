@@ -0,0 +1,34 @@
+from fastapi import APIRouter
+
+from routes.chats import semantic_cache, vector_store
+from utils.catalog_cache import catalog_cache
+from utils.llm_service import LLM_NAME, is_llm_loaded, load_llm_service
+
+router = APIRouter()
+
+
+@router.get("/llm")
+def get_llm_metrics():
+    """Batch-size/queue-wait histograms and response-cache counters for the shared LLM."""
+    if not is_llm_loaded():
+        # Don't load tens of GB of weights just to report metrics
+        return {"model": LLM_NAME, "loaded": False}
+    return {"loaded": True, **load_llm_service().stats()}
+
+
+@router.get("/semantic-cache")
+def get_semantic_cache_metrics():
+    """Hit/miss/eviction counters for the per-lecture semantic answer cache."""
+    return semantic_cache.stats()
+
+
+@router.get("/vector-store")
+def get_vector_store_metrics():
+    """Open time and query latency histogram for the shared Chroma store."""
+    return vector_store.stats()
+
+
+@router.get("/catalog-cache")
+def get_catalog_cache_metrics():
+    """Version, ETag and age of the in-memory subject/week/lecture snapshot."""
+    return catalog_cache.stats()
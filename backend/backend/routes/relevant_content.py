@@ -1,12 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, func, select
 from datetime import timedelta
-from database.database import get_db
+from database.database import get_async_db
 from models import RelevantContent, Lecture, StudySearchResult
 from pydantic import BaseModel, HttpUrl
 from typing import List, Optional
-import requests
+import httpx
 
 router = APIRouter()
 
@@ -29,13 +29,14 @@ class RelevantContentResponse(RelevantContentRequest):
 
 
 @router.get("/relevant-content/{lecture_id}", response_model=List[RelevantContentResponse])
-def get_relevant_content(lecture_id: int, user_id: Optional[int] = None, db: Session = Depends(get_db)):
-    query = db.query(RelevantContent).filter(RelevantContent.lecture_id == lecture_id)
+async def get_relevant_content(lecture_id: int, user_id: Optional[int] = None, db: AsyncSession = Depends(get_async_db)):
+    query = select(RelevantContent).where(RelevantContent.lecture_id == lecture_id)
 
     if user_id:
-        query = query.filter(RelevantContent.user_id == user_id)
+        query = query.where(RelevantContent.user_id == user_id)
 
-    content = query.order_by(RelevantContent.created_at).all()
+    result = await db.execute(query.order_by(RelevantContent.created_at))
+    content = result.scalars().all()
 
     if not content:
         raise HTTPException(status_code=404, detail="No relevant content found")
@@ -44,7 +45,7 @@ def get_relevant_content(lecture_id: int, user_id: Optional[int] = None, db: Ses
 
 
 @router.post("/relevant-content/", response_model=RelevantContentResponse)
-def add_relevant_content(request: RelevantContentRequest, db: Session = Depends(get_db)):
+async def add_relevant_content(request: RelevantContentRequest, db: AsyncSession = Depends(get_async_db)):
     new_content = RelevantContent(
         lecture_id=request.lecture_id,
         user_id=request.user_id,
@@ -55,33 +56,34 @@ def add_relevant_content(request: RelevantContentRequest, db: Session = Depends(
     )
 
     db.add(new_content)
-    db.commit()
-    db.refresh(new_content)
+    await db.commit()
+    await db.refresh(new_content)
 
     return new_content
 
 
 @router.post("/search-google")
-async def search_study_content(data: dict, db: Session = Depends(get_db)):
+async def search_study_content(data: dict, db: AsyncSession = Depends(get_async_db)):
     """Search for relevant study content using Google Custom Search API with caching."""
     try:
         lecture_id = data.get("lecture_id")
         query = data.get("query", "")
 
         # Check if we have cached results that are less than 24 hours old
-        cached_results = db.query(StudySearchResult).filter(
+        cached = await db.execute(select(StudySearchResult).where(
             and_(
                 StudySearchResult.lecture_id == lecture_id,
                 StudySearchResult.query == query,
                 StudySearchResult.created_at >= func.now() - timedelta(hours=24)
             )
-        ).order_by(StudySearchResult.created_at.desc()).limit(5).all()
+        ).order_by(StudySearchResult.created_at.desc()).limit(5))
+        cached_results = cached.scalars().all()
 
         if cached_results:
             # Update last_accessed timestamp
             for result in cached_results:
                 result.last_accessed = func.now()
-            db.commit()
+            await db.commit()
 
             return {
                 "results": [
@@ -96,7 +98,7 @@ async def search_study_content(data: dict, db: Session = Depends(get_db)):
             }
 
         # Get the lecture to include its content in the search
-        lecture = db.query(Lecture).filter(Lecture.id == lecture_id).first()
+        lecture = await db.get(Lecture, lecture_id)
         if not lecture:
             raise HTTPException(status_code=404, detail="Lecture not found")
 
@@ -119,7 +121,9 @@ async def search_study_content(data: dict, db: Session = Depends(get_db)):
             "num": 5
         }
 
-        response = requests.get(url, params=params)
+        # ✅ Non-blocking HTTP call: requests.get here would stall the whole event loop
+        async with httpx.AsyncClient(timeout=10) as client:
+            response = await client.get(url, params=params)
         response.raise_for_status()
         data = response.json()
 
@@ -145,7 +149,7 @@ async def search_study_content(data: dict, db: Session = Depends(get_db)):
             )
             db.add(db_result)
 
-        db.commit()
+        await db.commit()
         return {"results": results}
 
     except Exception as e:
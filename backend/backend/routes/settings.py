@@ -1,8 +1,9 @@
 from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from database.database import get_db
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from database.database import get_async_db
 from models.settings import Settings
 from pydantic import BaseModel, HttpUrl
 
@@ -30,8 +31,9 @@ class SettingsResponse(SettingsRequest):
 
 
 @router.get("/settings", response_model=SettingsResponse)
-def get_system_settings(db: Session = Depends(get_db)):
-    settings = db.query(Settings).first()
+async def get_system_settings(db: AsyncSession = Depends(get_async_db)):
+    result = await db.execute(select(Settings).limit(1))
+    settings = result.scalars().first()
 
     if not settings:
         raise HTTPException(status_code=404, detail="Settings not found")
@@ -40,8 +42,9 @@ def get_system_settings(db: Session = Depends(get_db)):
 
 
 @router.post("/settings", response_model=SettingsResponse)
-def update_system_settings(request: SettingsRequest, db: Session = Depends(get_db)):
-    settings = db.query(Settings).first()
+async def update_system_settings(request: SettingsRequest, db: AsyncSession = Depends(get_async_db)):
+    result = await db.execute(select(Settings).limit(1))
+    settings = result.scalars().first()
 
     if not settings:
         settings = Settings()
@@ -67,7 +70,7 @@ def update_system_settings(request: SettingsRequest, db: Session = Depends(get_d
     if request.streaming_mode is not None:
         settings.streaming_mode = request.streaming_mode
 
-    db.commit()
-    db.refresh(settings)
+    await db.commit()
+    await db.refresh(settings)
 
     return settings
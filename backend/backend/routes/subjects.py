@@ -1,13 +1,15 @@
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException
-from pydantic import BaseModel
-from sqlalchemy.orm import Session
-
-from database.database import get_db
-from models import Subject, User, UserSubject, Week
-from routes.weeks import WeekResponse
+from fastapi import APIRouter, Depends, HTTPException, Request
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database.database import get_async_db
+from models import Subject, User, UserSubject
+from routes.weeks import WEEK_LIST_ADAPTER, WeekResponse
 from utils.auth import get_current_user
+from utils.catalog_cache import catalog_cache, catalog_response
 
 router = APIRouter()
 
@@ -20,37 +22,48 @@ class SubjectRequest(BaseModel):
     name: str
 
 
+SUBJECT_ADAPTER = TypeAdapter(SubjectRequest)
+SUBJECT_LIST_ADAPTER = TypeAdapter(List[SubjectRequest])
+
+
 @router.post("/", response_model=Message)
-def create_subject(request: SubjectRequest, db: Session = Depends(get_db)):
+async def create_subject(request: SubjectRequest, db: AsyncSession = Depends(get_async_db)):
     subject = Subject(name=request.name)
     db.add(subject)
-    db.commit()
-    db.refresh(subject)
+    await db.commit()
+    await db.refresh(subject)
+    catalog_cache.invalidate()
     return {"message": "Subject created successfully"}
 
 
 @router.get("/", response_model=List[SubjectRequest])
-def get_subjects(db: Session = Depends(get_db)):
-    subjects = db.query(Subject).all()
-    return subjects
+async def get_subjects(request: Request, db: AsyncSession = Depends(get_async_db)):
+    catalog = await catalog_cache.get(db)
+    return catalog_response(request, catalog, "subjects", SUBJECT_LIST_ADAPTER,
+                            lambda: [s._asdict() for s in catalog.subjects])
 
 
 @router.get("/{subject_id}", response_model=SubjectRequest)
-def get_subjects(subject_id: int, db: Session = Depends(get_db)):
-    subject = db.query(Subject).filter(Subject.id == subject_id).first()
+async def get_subjects(subject_id: int, request: Request, db: AsyncSession = Depends(get_async_db)):
+    catalog = await catalog_cache.get(db)
+    subject = catalog.subject_by_id.get(subject_id)
+    if not subject:
+        raise HTTPException(status_code=404, detail="Subject not found")
 
-    return subject
+    return catalog_response(request, catalog, ("subject", subject_id), SUBJECT_ADAPTER, subject._asdict)
 
 
 @router.get("/{subject_id}/weeks", response_model=List[WeekResponse])
-def get_weeks(subject_id: int, db: Session = Depends(get_db)):
-    weeks = db.query(Week).filter(Week.subject_id == subject_id).all()
+async def get_weeks(subject_id: int, request: Request, db: AsyncSession = Depends(get_async_db)):
+    catalog = await catalog_cache.get(db)
+    weeks = catalog.weeks_for_subject(subject_id)
 
     if not weeks:
         raise HTTPException(status_code=404, detail="No weeks found for this subject")
 
     # return [{"week_id": week.id, "name": week.name} for week in weeks]
-    return weeks
+    return catalog_response(request, catalog, ("subject_weeks", subject_id), WEEK_LIST_ADAPTER,
+                            lambda: [week._asdict() for week in weeks])
 
 
 class UserSubjectRequest(BaseModel):
@@ -59,32 +72,34 @@ class UserSubjectRequest(BaseModel):
 
 
 @router.post("/user-subjects/", response_model=Message)
-def assign_subject_to_user(request: UserSubjectRequest, db: Session = Depends(get_db)):
+async def assign_subject_to_user(request: UserSubjectRequest, db: AsyncSession = Depends(get_async_db)):
     # Check if user exists
-    user = db.query(User).filter(User.id == request.user_id).first()
+    user = await db.get(User, request.user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
     # Check if subject exists
-    subject = db.query(Subject).filter(Subject.id == request.subject_id).first()
+    subject = await db.get(Subject, request.subject_id)
     if not subject:
         raise HTTPException(status_code=404, detail="Subject not found")
 
     # Assign subject to user
     user_subject = UserSubject(user_id=request.user_id, subject_id=request.subject_id)
     db.add(user_subject)
-    db.commit()
-    db.refresh(user_subject)
+    await db.commit()
+    await db.refresh(user_subject)
 
     return {"message": "User assigned to subject successfully"}
 
 
 @router.get("/user-subjects/{user_id}", response_model=List[UserSubjectRequest])
-def get_user_subjects(user_id: int, db: Session = Depends(get_db)):
-    user_subjects = db.query(UserSubject).filter(UserSubject.user_id == user_id).all()
+async def get_user_subjects(user_id: int, db: AsyncSession = Depends(get_async_db)):
+    result = await db.execute(select(UserSubject).where(UserSubject.user_id == user_id))
+    user_subjects = result.scalars().all()
 
     if not user_subjects:
         raise HTTPException(status_code=404, detail="No subjects found for this user")
 
-    subjects = db.query(Subject).filter(Subject.id.in_([us.subject_id for us in user_subjects])).all()
+    result = await db.execute(select(Subject).where(Subject.id.in_([us.subject_id for us in user_subjects])))
+    subjects = result.scalars().all()
     return [{"subject_id": s.id, "name": s.name} for s in subjects]
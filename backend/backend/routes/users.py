@@ -1,8 +1,9 @@
 from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from database.database import get_db
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from database.database import get_async_db
 from models import UserProfile
 from models.users import User
 from pydantic import BaseModel, HttpUrl
@@ -29,8 +30,9 @@ class UserProfileResponse(UserProfileRequest):
 
 # ✅ GET: Fetch User Profile
 @router.get("/profile/{user_id}", response_model=UserProfileResponse)
-def get_user_profile(user_id: int, db: Session = Depends(get_db)):
-    profile = db.query(UserProfile).filter(UserProfile.user_id == user_id).first()
+async def get_user_profile(user_id: int, db: AsyncSession = Depends(get_async_db)):
+    result = await db.execute(select(UserProfile).where(UserProfile.user_id == user_id))
+    profile = result.scalars().first()
 
     if not profile:
         raise HTTPException(status_code=404, detail="User profile not found")
@@ -40,13 +42,14 @@ def get_user_profile(user_id: int, db: Session = Depends(get_db)):
 
 # ✅ POST: Create or Update User Profile
 @router.post("/profile/{user_id}", response_model=UserProfileResponse)
-def update_user_profile(user_id: int, request: UserProfileRequest, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.id == user_id).first()
+async def update_user_profile(user_id: int, request: UserProfileRequest, db: AsyncSession = Depends(get_async_db)):
+    user = await db.get(User, user_id)
 
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    profile = db.query(UserProfile).filter(UserProfile.user_id == user_id).first()
+    result = await db.execute(select(UserProfile).where(UserProfile.user_id == user_id))
+    profile = result.scalars().first()
 
     if profile:
         # Update existing profile
@@ -69,7 +72,7 @@ def update_user_profile(user_id: int, request: UserProfileRequest, db: Session =
         )
         db.add(profile)
 
-    db.commit()
-    db.refresh(profile)
+    await db.commit()
+    await db.refresh(profile)
 
     return profile
@@ -1,6 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from database.database import get_db
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from database.database import get_async_db
+from utils.catalog_cache import catalog_cache
 from models import Video
 from pydantic import BaseModel, HttpUrl
 from typing import List, Optional
@@ -24,13 +26,14 @@ class VideoResponse(VideoRequest):
 
 
 @router.get("/", response_model=List[VideoResponse])
-def get_videos(week_id: Optional[int] = None, db: Session = Depends(get_db)):
-    query = db.query(Video)
+async def get_videos(week_id: Optional[int] = None, db: AsyncSession = Depends(get_async_db)):
+    query = select(Video)
 
     if week_id:
-        query = query.filter(Video.week_id == week_id)
+        query = query.where(Video.week_id == week_id)
 
-    videos = query.order_by(Video.week_id, Video.sequence_no).all()
+    result = await db.execute(query.order_by(Video.week_id, Video.sequence_no))
+    videos = result.scalars().all()
 
     if not videos:
         raise HTTPException(status_code=404, detail="No videos found")
@@ -39,7 +42,7 @@ def get_videos(week_id: Optional[int] = None, db: Session = Depends(get_db)):
 
 
 @router.post("/", response_model=VideoResponse)
-def create_video(request: VideoRequest, db: Session = Depends(get_db)):
+async def create_video(request: VideoRequest, db: AsyncSession = Depends(get_async_db)):
     new_video = Video(
         week_id=request.week_id,
         sequence_no=request.sequence_no,
@@ -48,7 +51,8 @@ def create_video(request: VideoRequest, db: Session = Depends(get_db)):
     )
 
     db.add(new_video)
-    db.commit()
-    db.refresh(new_video)
+    await db.commit()
+    await db.refresh(new_video)
+    catalog_cache.invalidate()
 
     return new_video
@@ -1,13 +1,14 @@
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException
-from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from database.database import get_db
-from models import Subject, Lecture
+from database.database import get_async_db
+from models import Subject
 from models.weeks import Week
-from routes.lectures import LectureResponse
+from routes.lectures import LECTURE_LIST_ADAPTER, LectureResponse
+from utils.catalog_cache import catalog_cache, catalog_response
 
 router = APIRouter()
 
@@ -21,27 +22,35 @@ class WeekResponse(WeekRequest):
     id: int
 
 
+WEEK_ADAPTER = TypeAdapter(WeekResponse)
+WEEK_LIST_ADAPTER = TypeAdapter(List[WeekResponse])
+
+
 @router.post("/", response_model=dict)
-def create_week(request: WeekRequest, db: Session = Depends(get_db)):
+async def create_week(request: WeekRequest, db: AsyncSession = Depends(get_async_db)):
     # Check if subject exists
-    subject = db.query(Subject).filter(Subject.id == request.subject_id).first()
+    subject = await db.get(Subject, request.subject_id)
     if not subject:
         raise HTTPException(status_code=404, detail="Subject not found")
 
     # Create a new week under the subject
     week = Week(name=request.name, subject_id=request.subject_id)
     db.add(week)
-    db.commit()
-    db.refresh(week)
+    await db.commit()
+    await db.refresh(week)
+    catalog_cache.invalidate()
 
     return {"message": "Week created successfully", "week_id": week.id}
 
 
 @router.get("/{week_id}", response_model=WeekResponse)
-def get_weeks_for_subject(week_id: int, db: Session = Depends(get_db)):
+async def get_weeks_for_subject(week_id: int, request: Request, db: AsyncSession = Depends(get_async_db)):
     # Get all weeks for the given subject
-    week = db.query(Week).filter(Week.id == week_id).first()
-    return week
+    catalog = await catalog_cache.get(db)
+    week = catalog.week_by_id.get(week_id)
+    if not week:
+        raise HTTPException(status_code=404, detail="Week not found")
+    return catalog_response(request, catalog, ("week", week_id), WEEK_ADAPTER, week._asdict)
     # if not weeks:
     #     raise HTTPException(status_code=404, detail="No weeks found for this subject")
     #
@@ -49,7 +58,9 @@ def get_weeks_for_subject(week_id: int, db: Session = Depends(get_db)):
 
 
 @router.get("/{week_id}/lectures", response_model=List[LectureResponse])
-def get_weeks_for_subject(week_id: int, db: Session = Depends(get_db)):
+async def get_weeks_for_subject(week_id: int, request: Request, db: AsyncSession = Depends(get_async_db)):
     # Get all weeks for the given subject
-    lectures = db.query(Lecture).filter(Lecture.week_id == week_id).order_by(Lecture.sequence_no).all()
-    return [LectureResponse.from_orm(lecture) for lecture in lectures]
+    catalog = await catalog_cache.get(db)
+    lectures = catalog.lectures_for_week(week_id)
+    return catalog_response(request, catalog, ("week_lectures", week_id), LECTURE_LIST_ADAPTER,
+                            lambda: [lecture._asdict() for lecture in lectures])
@@ -0,0 +1,38 @@
+from utils.llm_cache import LLMResponseCache
+
+PROMPT = "Will this code pass the tests?\n\n{code}\n"
+
+INSIDE_IF = """def f(x):
+    if x:
+        return 1
+        return 2
+"""
+
+AFTER_IF = """def f(x):
+    if x:
+        return 1
+    return 2
+"""
+
+
+def test_indentation_changes_the_key():
+    params = {"max_new_tokens": 256}
+    inside = LLMResponseCache.make_key(PROMPT.format(code=INSIDE_IF), "model", params)
+    after = LLMResponseCache.make_key(PROMPT.format(code=AFTER_IF), "model", params)
+    assert inside != after
+
+
+def test_surrounding_whitespace_shares_the_key():
+    params = {"max_new_tokens": 256}
+    prompt = PROMPT.format(code=AFTER_IF)
+    assert LLMResponseCache.make_key(prompt, "model", params) == \
+        LLMResponseCache.make_key(f"\n  {prompt}  \n", "model", params)
+
+
+def test_cached_response_round_trip(tmp_path):
+    cache = LLMResponseCache(str(tmp_path / "llm.sqlite3"))
+    inside = cache.make_key(PROMPT.format(code=INSIDE_IF), "model", {})
+    after = cache.make_key(PROMPT.format(code=AFTER_IF), "model", {})
+    cache.set(inside, "fails")
+    assert cache.get(inside) == "fails"
+    assert cache.get(after) is None
@@ -0,0 +1,46 @@
+from types import SimpleNamespace
+
+from utils.llm_batching import MicroBatcher
+from utils.llm_service import LLMProfile, LLMService
+
+
+class StubPipe:
+    """Records each call and echoes the prompts back in the text-generation pipeline's output shape."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, prompts, **kwargs):
+        self.calls.append((list(prompts), kwargs))
+        return [[{"generated_text": f"answer to {prompt}"}] for prompt in prompts]
+
+
+def make_profile(name, max_new_tokens):
+    service = SimpleNamespace(pipe=StubPipe())
+    return LLMProfile(service, name, max_new_tokens), service.pipe
+
+
+def test_profile_max_new_tokens_reaches_the_pipeline():
+    chat, chat_pipe = make_profile("chat", 256)
+    code, code_pipe = make_profile("code", 512)
+
+    assert chat.generate_batch(["q"]) == ["answer to q"]
+    code.generate_batch(["q"])
+
+    assert chat_pipe.calls[0][1]["max_new_tokens"] == 256
+    assert code_pipe.calls[0][1]["max_new_tokens"] == 512
+
+
+def test_batched_outputs_map_to_their_futures_in_order():
+    service = LLMService.__new__(LLMService)
+    service.pipe = StubPipe()
+    service.profiles = {"chat": LLMProfile(service, "chat", 256)}
+    service.batcher = MicroBatcher(service._run_batch, max_batch_size=8, max_wait_ms=200)
+
+    prompts = [f"question {i}" for i in range(5)]
+    futures = [service.batcher.submit("chat", prompt) for prompt in prompts]
+
+    assert [future.result(timeout=5) for future in futures] == [f"answer to {p}" for p in prompts]
+    assert [call[0] for call in service.pipe.calls] == [prompts]
+    assert service.pipe.calls[0][1]["batch_size"] == len(prompts)
+    assert service.pipe.calls[0][1]["return_full_text"] is False
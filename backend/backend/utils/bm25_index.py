@@ -0,0 +1,152 @@
+import gzip
+import json
+import math
+import os
+import re
+import threading
+from collections import Counter, defaultdict
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> list:
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class BM25Index:
+    """
+    In-process inverted index over transcript chunks, scored with Okapi BM25.
+
+    Documents carry the same ids and metadata as their Chroma counterparts so lexical
+    and vector results can be fused by id.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.documents = {}  # id -> {"text", "metadata", "length"}
+        self.postings = defaultdict(dict)  # term -> {id: term frequency}
+        self.total_length = 0
+
+    def __len__(self):
+        return len(self.documents)
+
+    def add_documents(self, ids: list, texts: list, metadatas: list):
+        for doc_id, text, metadata in zip(ids, texts, metadatas):
+            if doc_id in self.documents:
+                self.remove_documents([doc_id])
+
+            terms = Counter(tokenize(text))
+            length = sum(terms.values())
+            self.documents[doc_id] = {"text": text, "metadata": metadata, "length": length}
+            self.total_length += length
+            for term, frequency in terms.items():
+                self.postings[term][doc_id] = frequency
+
+    def remove_documents(self, ids: list):
+        for doc_id in ids:
+            document = self.documents.pop(doc_id, None)
+            if document is None:
+                continue
+            self.total_length -= document["length"]
+            for term in set(tokenize(document["text"])):
+                postings = self.postings.get(term)
+                if postings is not None:
+                    postings.pop(doc_id, None)
+                    if not postings:
+                        del self.postings[term]
+
+    def remove_lecture(self, lecture_id: int):
+        self.remove_documents([
+            doc_id for doc_id, document in self.documents.items()
+            if document["metadata"].get("lecture_id") == lecture_id
+        ])
+
+    def search(self, query: str, k: int = 20, lecture_id: int = None) -> list:
+        """Returns [(doc_id, score)] best first, optionally restricted to one lecture."""
+        if not self.documents:
+            return []
+
+        count = len(self.documents)
+        average_length = self.total_length / count
+        scores = defaultdict(float)
+
+        for term in set(tokenize(query)):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc_id, frequency in postings.items():
+                if lecture_id is not None and self.documents[doc_id]["metadata"].get("lecture_id") != lecture_id:
+                    continue
+                length_norm = 1 - self.b + self.b * self.documents[doc_id]["length"] / average_length
+                scores[doc_id] += idf * frequency * (self.k1 + 1) / (frequency + self.k1 * length_norm)
+
+        return sorted(scores.items(), key=lambda item: item[1], reverse=True)[:k]
+
+    def save(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        payload = {
+            "k1": self.k1,
+            "b": self.b,
+            "documents": [
+                {"id": doc_id, "text": document["text"], "metadata": document["metadata"]}
+                for doc_id, document in self.documents.items()
+            ]
+        }
+        tmp_path = path + ".tmp"
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            json.dump(payload, f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "BM25Index":
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            payload = json.load(f)
+
+        index = cls(k1=payload.get("k1", 1.5), b=payload.get("b", 0.75))
+        documents = payload["documents"]
+        index.add_documents(
+            [d["id"] for d in documents],
+            [d["text"] for d in documents],
+            [d["metadata"] for d in documents]
+        )
+        return index
+
+
+class ReloadingBM25Index:
+    """
+    Read-side handle used by the API: loads the persisted index and reloads it
+    whenever the indexer rewrites the file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._index = None
+        self._mtime = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except OSError:
+            return None
+
+        if mtime != self._mtime:
+            with self._lock:
+                if mtime != self._mtime:
+                    self._index = BM25Index.load(self.path)
+                    self._mtime = mtime
+                    print(f"📚 Loaded lexical index ({len(self._index)} chunks) from {self.path}")
+        return self._index
+
+
+def reciprocal_rank_fusion(rankings: list, k: int = 60) -> list:
+    """Fuses several ranked id lists: score(id) = sum(1 / (k + rank)). Returns ids best first."""
+    scores = defaultdict(float)
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking, start=1):
+            scores[doc_id] += 1.0 / (k + rank)
+    return sorted(scores, key=scores.get, reverse=True)
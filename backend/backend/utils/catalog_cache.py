@@ -0,0 +1,206 @@
+"""
+In-process read-through cache of the course catalog (subjects -> weeks -> lectures).
+
+The whole tree is loaded with one query into an immutable snapshot and swapped in atomically.
+The create_* routes call `catalog_cache.invalidate()` after committing; the next read reloads.
+Other processes (more uvicorn workers, scripts writing to the DB) can't invalidate this one,
+so snapshots also expire after CATALOG_CACHE_TTL_SECONDS.
+"""
+import asyncio
+import hashlib
+import json
+import os
+import time
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+from fastapi import Request
+from fastapi.responses import Response
+from pydantic import TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models import Lecture, Subject, Week
+
+CATALOG_CACHE_TTL_SECONDS = float(os.getenv("CATALOG_CACHE_TTL_SECONDS", "300"))
+
+
+class CatalogSubject(NamedTuple):
+    id: int
+    name: Optional[str]
+
+
+class CatalogWeek(NamedTuple):
+    id: int
+    name: Optional[str]
+    subject_id: int
+
+
+class CatalogLecture(NamedTuple):
+    id: int
+    week_id: int
+    sequence_no: Optional[int]
+    name: str
+    type: str
+    url: Optional[str]
+    video_id: Optional[str]
+    content: Optional[Dict[str, Any]]
+    created_at: str
+
+
+class CatalogSnapshot:
+    """
+    One consistent, read-only view of the catalog. Never mutate it; build a new one.
+    The only thing filled in later is the memo of serialized response bodies.
+    """
+
+    def __init__(self, version: int, subjects, weeks, lectures):
+        self.version = version
+        self.loaded_at = time.monotonic()
+        self.subjects: Tuple[CatalogSubject, ...] = tuple(subjects)  # by id
+        self.weeks: Tuple[CatalogWeek, ...] = tuple(weeks)  # by id
+        self.lectures: Tuple[CatalogLecture, ...] = tuple(lectures)  # by week_id, sequence_no
+
+        self.subject_by_id = {s.id: s for s in self.subjects}
+        self.week_by_id = {w.id: w for w in self.weeks}
+        weeks_by_subject = {}
+        for week in self.weeks:
+            weeks_by_subject.setdefault(week.subject_id, []).append(week)
+        self.weeks_by_subject = {k: tuple(v) for k, v in weeks_by_subject.items()}
+        lectures_by_week = {}
+        for lecture in self.lectures:
+            lectures_by_week.setdefault(lecture.week_id, []).append(lecture)
+        self.lectures_by_week = {k: tuple(v) for k, v in lectures_by_week.items()}
+
+        # Content-derived, so every worker process serving the same data agrees on it
+        digest = hashlib.sha256(json.dumps(
+            [[s._asdict() for s in self.subjects], [w._asdict() for w in self.weeks],
+             [l._asdict() for l in self.lectures]],
+            sort_keys=True, default=str
+        ).encode()).hexdigest()
+        self.etag = f'"catalog-{digest[:20]}"'
+        self._bodies = {}  # response key -> (JSON bytes, ETag)
+
+    def weeks_for_subject(self, subject_id: int):
+        return self.weeks_by_subject.get(subject_id, ())
+
+    def lectures_for_week(self, week_id: int):
+        return self.lectures_by_week.get(week_id, ())
+
+    def serialized(self, key, adapter: TypeAdapter, build) -> Tuple[bytes, str]:
+        """
+        `build()` validated and dumped through the route's response model, with an ETag of the bytes.
+        Memoized per key for the lifetime of the snapshot.
+        """
+        cached = self._bodies.get(key)
+        if cached is not None:
+            return cached
+
+        payload = build()
+        body = adapter.dump_json(adapter.validate_python(payload))
+        cached = (body, f'"catalog-{hashlib.sha256(body).hexdigest()[:20]}"')
+        # Every unknown id serializes to an empty list; don't let arbitrary ids grow the memo
+        if payload:
+            self._bodies[key] = cached
+        return cached
+
+
+async def load_catalog(db: AsyncSession, version: int) -> CatalogSnapshot:
+    """Reads subjects, weeks and lectures in a single outer-joined query."""
+    result = await db.execute(
+        select(Subject, Week, Lecture)
+        .outerjoin(Week, Week.subject_id == Subject.id)
+        .outerjoin(Lecture, Lecture.week_id == Week.id)
+        .order_by(Subject.id, Week.id, Lecture.sequence_no, Lecture.id)
+    )
+
+    subjects, weeks, lectures = {}, {}, []
+    for subject, week, lecture in result.all():
+        subjects.setdefault(subject.id, CatalogSubject(id=subject.id, name=subject.name))
+        if week is not None:
+            weeks.setdefault(week.id, CatalogWeek(id=week.id, name=week.name, subject_id=week.subject_id))
+        if lecture is not None:
+            lectures.append(CatalogLecture(
+                id=lecture.id,
+                week_id=lecture.week_id,
+                sequence_no=lecture.sequence_no,
+                name=lecture.name,
+                type=lecture.type,
+                url=lecture.url,
+                video_id=lecture.video_id,
+                content=lecture.content,
+                created_at=lecture.created_at.isoformat()
+            ))
+
+    # Same order as `ORDER BY week_id, sequence_no`; the sort is stable within a week
+    lectures.sort(key=lambda l: l.week_id)
+    return CatalogSnapshot(
+        version,
+        sorted(subjects.values(), key=lambda s: s.id),
+        sorted(weeks.values(), key=lambda w: w.id),
+        lectures
+    )
+
+
+class CatalogCache:
+    def __init__(self, ttl_seconds: float = CATALOG_CACHE_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._version = 0
+        self._lock = asyncio.Lock()
+
+    def _fresh(self, snapshot: Optional[CatalogSnapshot]) -> bool:
+        return (snapshot is not None and snapshot.version == self._version
+                and time.monotonic() - snapshot.loaded_at < self.ttl_seconds)
+
+    async def get(self, db: AsyncSession) -> CatalogSnapshot:
+        """Current snapshot; concurrent misses share a single reload."""
+        snapshot = self._snapshot
+        if self._fresh(snapshot):
+            return snapshot
+
+        async with self._lock:
+            snapshot = self._snapshot
+            if self._fresh(snapshot):
+                return snapshot
+
+            version = self._version
+            snapshot = await load_catalog(db, version)
+            # A write that committed while we were reading has bumped the version; don't
+            # install what may be pre-write data as current (the next read reloads).
+            if version == self._version:
+                self._snapshot = snapshot
+                print(f"📚 Catalog cache loaded: {len(snapshot.subjects)} subjects, "
+                      f"{len(snapshot.weeks)} weeks, {len(snapshot.lectures)} lectures")
+            return snapshot
+
+    def invalidate(self):
+        """Call after committing any change to subjects, weeks, lectures, videos or assignments."""
+        self._version += 1
+        self._snapshot = None
+
+    def stats(self) -> dict:
+        snapshot = self._snapshot
+        return {
+            "version": self._version,
+            "loaded": snapshot is not None,
+            "etag": snapshot.etag if snapshot else None,
+            "age_seconds": round(time.monotonic() - snapshot.loaded_at, 1) if snapshot else None
+        }
+
+
+catalog_cache = CatalogCache()
+
+
+def catalog_response(request: Request, snapshot: CatalogSnapshot, key, adapter: TypeAdapter, build) -> Response:
+    """
+    JSON response for `build()` serialized through `adapter` (a TypeAdapter of the route's
+    response_model, which FastAPI skips for a returned Response), tagged with an ETag of the body,
+    or 304 if the client already has it. `key` names the body within the snapshot's memo.
+    """
+    body, etag = snapshot.serialized(key, adapter, build)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")] \
+            or if_none_match.strip() == "*":
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -0,0 +1,76 @@
+import os
+
+# ✅ Default chunking for index builds (env overridable, or per build via the indexer CLI)
+CHUNK_STRATEGY = os.getenv("CHUNK_STRATEGY", "window")
+# Whitespace tokens; 160 words stays under MiniLM's 256 word-piece limit
+CHUNK_MAX_TOKENS = int(os.getenv("CHUNK_MAX_TOKENS", "160"))
+CHUNK_OVERLAP_TOKENS = int(os.getenv("CHUNK_OVERLAP_TOKENS", "30"))
+
+CHUNK_STRATEGIES = ("segment", "window")
+
+
+def chunking_config(strategy: str = None, max_tokens: int = None, overlap_tokens: int = None) -> dict:
+    """
+    The chunking parameters of an index build, as recorded in the index manifest.
+    """
+    strategy = strategy or CHUNK_STRATEGY
+    if strategy not in CHUNK_STRATEGIES:
+        raise ValueError(f"Unknown chunking strategy '{strategy}', expected one of {CHUNK_STRATEGIES}")
+    if strategy == "segment":
+        return {"strategy": "segment"}
+    return {
+        "strategy": "window",
+        "max_tokens": max_tokens or CHUNK_MAX_TOKENS,
+        "overlap_tokens": CHUNK_OVERLAP_TOKENS if overlap_tokens is None else overlap_tokens
+    }
+
+
+def count_tokens(text: str) -> int:
+    return len(text.split())
+
+
+def merge_segments(segments: list) -> dict:
+    return {
+        "start_time": segments[0]["start_time"],
+        "end_time": segments[-1]["end_time"],
+        "text": " ".join(segment["text"].strip() for segment in segments)
+    }
+
+
+def chunk_transcript(segments: list, chunking: dict) -> list:
+    """
+    Turns transcript segments into index chunks.
+
+    "segment" keeps one chunk per Whisper segment. "window" merges consecutive segments into
+    chunks of at most `max_tokens`, each repeating about `overlap_tokens` from the end of the
+    previous one. A chunk keeps its first segment's start_time, so deep links still land on it.
+    """
+    if chunking.get("strategy", "segment") == "segment" or not segments:
+        return segments
+
+    max_tokens = chunking["max_tokens"]
+    overlap_tokens = chunking["overlap_tokens"]
+    lengths = [count_tokens(segment["text"]) for segment in segments]
+
+    chunks = []
+    start = 0
+    while start < len(segments):
+        end = start + 1
+        total = lengths[start]
+        while end < len(segments) and total + lengths[end] <= max_tokens:
+            total += lengths[end]
+            end += 1
+        chunks.append(merge_segments(segments[start:end]))
+
+        if end >= len(segments):
+            break
+
+        # Step back over whole segments to cover the overlap, but always move forward
+        next_start = end
+        overlap = 0
+        while next_start - 1 > start and overlap + lengths[next_start - 1] <= overlap_tokens:
+            next_start -= 1
+            overlap += lengths[next_start]
+        start = next_start
+
+    return chunks
@@ -0,0 +1,39 @@
+"""
+Settings shared by the API and the ingestion pipeline (ingest.py, utils/index_worker.py).
+
+Keep this module free of heavy imports: the API reads its paths from here instead of
+importing the ingestion modules, which pull in Whisper, yt_dlp and ffmpeg tooling.
+"""
+import os
+import sys
+
+# ✅ Persistent index storage
+CHROMA_DB_PATH = os.getenv("CHROMA_DB_PATH", "chroma_db")
+# ✅ Lexical (BM25) index over the same chunks, persisted next to Chroma
+BM25_INDEX_PATH = os.path.join(CHROMA_DB_PATH, "bm25_index.json.gz")
+# ✅ Memory-mapped embedding matrix for the NumPy exact-search backend
+NUMPY_STORE_PATH = os.path.join(CHROMA_DB_PATH, "numpy_store")
+# ✅ What each indexed lecture was built from (source, hashes, model, chunking)
+MANIFEST_PATH = os.path.join(CHROMA_DB_PATH, "index_manifest.json")
+# ✅ Per-lecture index versions, bumped by the indexer to invalidate cached answers
+INDEX_VERSIONS_PATH = os.path.join(CHROMA_DB_PATH, "index_versions.json")
+
+# Transcripts and normalized audio, written by ingestion only
+TRANSCRIPTS_DIR = os.getenv("TRANSCRIPTS_DIR", "transcripts")
+MEDIA_CACHE_DIR = os.getenv("MEDIA_CACHE_DIR", "media_cache")
+
+# Must be the same model at index and query time
+EMBEDDING_MODEL_NAME = os.getenv("EMBEDDING_MODEL_NAME", "sentence-transformers/all-MiniLM-L6-v2")
+
+# Modules only the ingestion pipeline may load
+INGESTION_ONLY_MODULES = ("whisper", "faster_whisper", "yt_dlp")
+
+
+def assert_no_ingestion_imports():
+    """Fails API startup if anything imported transcription / download libraries."""
+    loaded = [name for name in INGESTION_ONLY_MODULES if name in sys.modules]
+    if loaded:
+        raise RuntimeError(
+            f"API process imported ingestion-only modules {loaded}; "
+            "import paths from utils.config instead of utils.index_lectures"
+        )
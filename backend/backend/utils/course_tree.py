@@ -0,0 +1,33 @@
+"""
+Week -> lectures / quizzes tree for the dashboards, built with a fixed number of round-trips
+(the cached catalog plus one quiz query) however many weeks the course has.
+"""
+from datetime import datetime, time as dt_time, timedelta
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models import Quiz
+from utils.catalog_cache import CatalogSnapshot, catalog_cache
+
+
+class CourseTree:
+    def __init__(self, catalog: CatalogSnapshot, quizzes):
+        self.catalog = catalog
+        self.weeks = catalog.weeks  # by id
+        self.quizzes = tuple(quizzes)  # newest first
+
+    def lectures_for_week(self, week_id: int):
+        return self.catalog.lectures_for_week(week_id)
+
+    def latest_quizzes(self, days: int = 7, now: datetime = None):
+        """Quizzes dated within the last `days` days (same bounds as comparing the DATE column to now())."""
+        now = now or datetime.now()
+        since = now - timedelta(days=days)
+        return [q for q in self.quizzes if since <= datetime.combine(q.date, dt_time.min) <= now]
+
+
+async def load_course_tree(db: AsyncSession) -> CourseTree:
+    catalog = await catalog_cache.get(db)
+    result = await db.execute(select(Quiz).order_by(Quiz.date.desc()))
+    return CourseTree(catalog, result.scalars().all())
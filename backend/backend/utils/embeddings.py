@@ -0,0 +1,43 @@
+import threading
+import time
+
+from langchain_core.embeddings import Embeddings
+
+from utils.config import EMBEDDING_MODEL_NAME
+
+
+class LazyEmbeddings(Embeddings):
+    """
+    HuggingFace sentence embeddings that load the model on first use (warmup or first query)
+    instead of at import, so the API can start serving non-AI routes immediately.
+    """
+
+    def __init__(self, model_name: str = EMBEDDING_MODEL_NAME):
+        self.model_name = model_name
+        self._model = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._model is not None
+
+    def load(self):
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    from langchain_huggingface import HuggingFaceEmbeddings
+
+                    started_at = time.perf_counter()
+                    self._model = HuggingFaceEmbeddings(
+                        model_name=self.model_name,
+                        model_kwargs={'device': 'cpu'},
+                        encode_kwargs={'normalize_embeddings': False}
+                    )
+                    print(f"⏱️ Loaded embeddings {self.model_name} in {time.perf_counter() - started_at:.1f}s")
+        return self._model
+
+    def embed_documents(self, texts: list) -> list:
+        return self.load().embed_documents(texts)
+
+    def embed_query(self, text: str) -> list:
+        return self.load().embed_query(text)
@@ -0,0 +1,105 @@
+import datetime
+import os
+import socket
+
+from sqlalchemy import and_, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from models import IndexJob
+
+ACTIVE_STATUSES = ("queued", "running")
+# A running job whose worker hasn't reported progress for this long is considered abandoned
+STALE_JOB_SECONDS = int(os.getenv("INDEX_JOB_STALE_SECONDS", "900"))
+MAX_ATTEMPTS = int(os.getenv("INDEX_JOB_MAX_ATTEMPTS", "3"))
+
+# Share of overall progress per stage, in pipeline order
+STAGE_WEIGHTS = {"downloading": 0.1, "transcribing": 0.7, "embedding": 0.2}
+
+
+def utcnow():
+    return datetime.datetime.now(datetime.timezone.utc)
+
+
+async def enqueue_index_job(db: AsyncSession, lecture_id: int, reindex: bool = False) -> IndexJob:
+    """
+    Queues a lecture for indexing, or returns its job if one is already queued or running.
+    Only inserts the row; a worker (`python ingest.py worker`) does the work.
+    """
+    result = await db.execute(
+        select(IndexJob).where(
+            IndexJob.lecture_id == lecture_id,
+            IndexJob.status.in_(ACTIVE_STATUSES)
+        ).order_by(IndexJob.id.desc()).limit(1)
+    )
+    job = result.scalars().first()
+    if job:
+        return job
+
+    job = IndexJob(lecture_id=lecture_id, status="queued", stage="queued", progress=0.0, reindex=reindex, attempts=0)
+    db.add(job)
+    await db.flush()
+    return job
+
+
+def claim_next_job(db: Session):
+    """
+    Atomically claims the oldest queued (or abandoned) job with FOR UPDATE SKIP LOCKED,
+    so several workers can poll the same table without double-processing. Commits the claim.
+    """
+    stale_before = utcnow() - datetime.timedelta(seconds=STALE_JOB_SECONDS)
+    job = db.query(IndexJob).filter(
+        or_(
+            IndexJob.status == "queued",
+            and_(IndexJob.status == "running", IndexJob.heartbeat_at < stale_before)
+        ),
+        IndexJob.attempts < MAX_ATTEMPTS
+    ).order_by(IndexJob.created_at).with_for_update(skip_locked=True).first()
+
+    if job is None:
+        db.rollback()
+        return None
+
+    now = utcnow()
+    job.status = "running"
+    job.stage = "queued"
+    job.progress = 0.0
+    job.error = None
+    job.attempts += 1
+    job.worker = f"{socket.gethostname()}:{os.getpid()}"
+    job.started_at = now
+    job.heartbeat_at = now
+    job.finished_at = None
+    db.commit()
+    return job
+
+
+def overall_progress(stage: str, fraction: float) -> float:
+    """Maps progress within one stage onto the job's 0.0 - 1.0 progress."""
+    done = 0.0
+    for name, weight in STAGE_WEIGHTS.items():
+        if name == stage:
+            return round(done + weight * min(max(fraction, 0.0), 1.0), 3)
+        done += weight
+    return 1.0 if stage == "done" else 0.0
+
+
+def update_job_progress(db: Session, job: IndexJob, stage: str, fraction: float = 0.0):
+    job.stage = stage
+    job.progress = max(job.progress or 0.0, overall_progress(stage, fraction))
+    job.heartbeat_at = utcnow()
+    db.commit()
+
+
+def finish_job(db: Session, job: IndexJob, error: str = None):
+    now = utcnow()
+    job.status = "failed" if error else "succeeded"
+    job.error = error
+    if not error:
+        job.stage = "done"
+        job.progress = 1.0
+    job.finished_at = now
+    job.heartbeat_at = now
+    if job.started_at:
+        job.duration_seconds = round((now - job.started_at).total_seconds(), 1)
+    db.commit()
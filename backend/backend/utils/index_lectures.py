@@ -2,25 +2,57 @@ from langchain_chroma import Chroma
 from langchain_huggingface import HuggingFaceEmbeddings
 from database.database import SessionLocal
 from models import Lecture
-import yt_dlp
-import whisper
+from database.numpy_store import export_numpy_store
+from utils.bm25_index import BM25Index
+from utils.chunking import chunk_transcript, chunking_config
+from utils.config import BM25_INDEX_PATH, CHROMA_DB_PATH, EMBEDDING_MODEL_NAME, MANIFEST_PATH, NUMPY_STORE_PATH
+from utils.index_manifest import REEMBED, SKIP, TRANSCRIBE, IndexManifest, transcript_sha256
+from utils.index_versions import bump_index_version
+from utils.media_cache import get_media_cache
+from utils.streaming_transcription import load_audio, report_skipped, transcribe_clip, transcribe_windows
+from utils.transcript_store import load_matching_transcript, load_transcript, save_transcript
+from utils.transcription import WHISPER_MODEL_SIZE, load_transcription_backend, to_transcript_chunks
 import os
-from pydub import AudioSegment
 
-# ✅ Define a persistent storage path
-CHROMA_DB_PATH = "chroma_db"
+# Paths and the embedding model live in utils/config.py, shared with the API
 os.environ["TOKENIZERS_PARALLELISM"] = "false"
-# ✅ Load HuggingFace embeddings
-model_kwargs = {'device': 'cpu'}
-encode_kwargs = {'normalize_embeddings': False}
-embeddings = HuggingFaceEmbeddings(
-    model_name="sentence-transformers/all-MiniLM-L6-v2",
-    model_kwargs=model_kwargs,
-    encode_kwargs=encode_kwargs
-)
 
-# Initialize Whisper model on CPU
-whisper_model = whisper.load_model("small", device="cpu")
+# Stored transcripts are reused across backends of the same model size
+WHISPER_MODEL_NAME = WHISPER_MODEL_SIZE
+# ✅ Cut silence / music out of the audio before Whisper (set TRANSCRIBE_VAD=0 to disable)
+TRANSCRIBE_VAD = os.getenv("TRANSCRIBE_VAD", "1") != "0"
+# ✅ Default chunking: consecutive segments merged into token-bounded windows (see utils/chunking.py)
+CHUNKING = chunking_config()
+
+_embeddings = None
+_transcription_backend = None
+
+
+def get_embeddings():
+    """
+    HuggingFace embeddings, loaded on first use (once per process, including pool workers).
+    """
+    global _embeddings
+    if _embeddings is None:
+        model_kwargs = {'device': 'cpu'}
+        encode_kwargs = {'normalize_embeddings': False}
+        _embeddings = HuggingFaceEmbeddings(
+            model_name=EMBEDDING_MODEL_NAME,
+            model_kwargs=model_kwargs,
+            encode_kwargs=encode_kwargs
+        )
+    return _embeddings
+
+
+def get_transcription_backend():
+    """
+    Transcription backend (TRANSCRIBE_BACKEND), loaded on first use (once per process, including pool workers).
+    """
+    global _transcription_backend
+    if _transcription_backend is None:
+        _transcription_backend = load_transcription_backend()
+        print(f"🎙️ Loaded transcription backend {_transcription_backend!r}")
+    return _transcription_backend
 
 
 # def download_youtube_audio(youtube_url: str, output_path="downloads/audio.mp3"):
@@ -45,6 +77,8 @@ def download_youtube_audio(youtube_url: str, output_path="downloads/audio.mp3"):
     """
     Downloads audio from a YouTube video if not already downloaded.
     """
+    import yt_dlp
+
     output_file = output_path + ".mp3"
     if os.path.exists(output_file):
         print(f"📁 Audio already downloaded at: {output_file}")
@@ -66,65 +100,70 @@ def download_youtube_audio(youtube_url: str, output_path="downloads/audio.mp3"):
     return output_file
 
 
-def transcribe_audio(audio_path: str):
+def transcribe_audio(audio_path: str, vad: bool = None):
     """
     Transcribes audio to text using Whisper and returns text with timestamps.
+
+    With VAD on, silence is cut out before Whisper runs; timestamps still refer to the original audio.
     """
-    result = whisper_model.transcribe(audio_path, fp16=False)
+    vad = TRANSCRIBE_VAD if vad is None else vad
+    audio = load_audio(audio_path)
+    segments, speech_seconds = transcribe_clip(get_transcription_backend(), audio, vad=vad)
+    if vad:
+        report_skipped(audio_path, len(audio) / 1000, speech_seconds)
+    del audio
 
-    transcript_chunks = []
-    for segment in result["segments"]:
-        start_time = round(segment["start"], 2)
-        end_time = round(segment["end"], 2)
-        text = segment["text"]
-
-        transcript_chunks.append({
-            "start_time": start_time,
-            "end_time": end_time,
-            "text": text
-        })
+    return to_transcript_chunks(segments)
 
-    return transcript_chunks
+
+def fetch_lecture_audio(lecture_id: int, youtube_url: str):
+    """
+    Returns (wav_path, audio_hash) for a lecture's audio from the media cache,
+    downloading and normalizing it to 16 kHz mono only on a cache miss.
+    """
+    audio_path, audio_hash = get_media_cache().fetch(youtube_url)
+    print(f"📁 Lecture {lecture_id} audio: {audio_path}")
+    return audio_path, audio_hash
 
 
 def process_youtube_video(youtube_url: str, name='1'):
     """
     Downloads and transcribes a YouTube video, returning text chunks with timestamps.
     """
-    # Create downloads directory if it doesn't exist
-    os.makedirs("downloads", exist_ok=True)
-
-    audio_path = download_youtube_audio(youtube_url, f"downloads/lecture_{name}")
+    audio_path, _ = fetch_lecture_audio(name, youtube_url)
     transcript_chunks = transcribe_audio(audio_path)
     # os.remove(audio_path)  # Clean up the audio file after processing
 
     return transcript_chunks
 
 
-def index_lecture_video(lecture_id: int, youtube_url: str, reindex: bool = False):
+def load_indexed_transcript(vectorstore: Chroma, lecture_id: int) -> list:
     """
-    Transcribes a YouTube video and indexes the text with timestamps into ChromaDB.
+    Reads a lecture's transcript segments back out of Chroma metadata, in time order.
     """
-    print(f"📌 Checking lecture {lecture_id} for indexing...")
+    stored = vectorstore.get(where={"lecture_id": lecture_id}, include=["metadatas"])
+    segments = [
+        {"start_time": m["start_time"], "end_time": m["end_time"], "text": m["text"]}
+        for m in stored["metadatas"]
+    ]
+    return sorted(segments, key=lambda segment: segment["start_time"])
 
-    # Initialize vector store
-    vectorstore = Chroma(persist_directory=CHROMA_DB_PATH, embedding_function=embeddings)
-
-    # 🔹 Check if the lecture is already indexed (based on first transcript chunk)
-    existing_docs = vectorstore.get(["{}_0".format(lecture_id)])
-
-    if existing_docs["documents"] and not reindex:
-        print(f"✅ Lecture {lecture_id} is already indexed. Skipping...")
-        return
-    else:
-        vectorstore.delete(where={"lecture_id": lecture_id})
 
-    print(f"📌 Indexing lecture {lecture_id}...")
+def load_lecture_transcript(vectorstore: Chroma, lecture_id: int) -> list:
+    """
+    Stored transcript for re-embedding: the transcript store first, falling back to
+    Chroma metadata for lectures indexed before the store existed.
+    """
+    stored = load_transcript(lecture_id)
+    if stored:
+        return stored["segments"]
+    return load_indexed_transcript(vectorstore, lecture_id)
 
-    # 🔹 Get transcript with timestamps
-    transcript_chunks = process_youtube_video(youtube_url, name=str(lecture_id))
 
-    # Prepare data for bulk insertion
+def build_lecture_documents(lecture_id: int, youtube_url: str, transcript_chunks: list):
+    """
+    Turns transcript chunks (after `chunk_transcript`) into Chroma texts, metadatas and ids.
+    """
     docs = []
     metadatas = []
     ids = []
@@ -140,31 +179,228 @@ def index_lecture_video(lecture_id: int, youtube_url: str, reindex: bool = False
         })
         ids.append(f"{lecture_id}_{chunk['start_time']}")  # Unique ID
 
+    return docs, metadatas, ids
+
+
+def open_vectorstore() -> Chroma:
+    return Chroma(persist_directory=CHROMA_DB_PATH, embedding_function=get_embeddings())
+
+
+def write_lecture_index(vectorstore: Chroma, lecture_id: int, youtube_url: str, transcript_chunks: list,
+                        vectors: list = None, refresh_exports: bool = True, chunking: dict = None):
+    """
+    Replaces a lecture's chunks in ChromaDB. Only ever called from one process (the single writer).
+
+    Transcript segments are chunked with `chunking` (default CHUNKING) first.
+    `vectors` are precomputed chunk embeddings (parallel mode); otherwise Chroma embeds the texts.
+    With `refresh_exports=False` the BM25 index and NumPy matrix are left for the caller to rebuild once.
+    """
+    chunks = chunk_transcript(transcript_chunks, chunking or CHUNKING)
+    docs, metadatas, ids = build_lecture_documents(lecture_id, youtube_url, chunks)
+
+    vectorstore.delete(where={"lecture_id": lecture_id})
+
     # 🔹 Add documents to ChromaDB
-    vectorstore.add_texts(texts=docs, metadatas=metadatas, ids=ids)
+    if vectors is not None:
+        vectorstore._collection.upsert(ids=ids, embeddings=vectors, metadatas=metadatas, documents=docs)
+    else:
+        vectorstore.add_texts(texts=docs, metadatas=metadatas, ids=ids)
+
+    if refresh_exports:
+        # 🔹 Keep the BM25 index in sync with Chroma
+        update_lexical_index(vectorstore, lecture_id, docs, metadatas, ids)
+
+        # 🔹 Refresh the exact-search matrix used by RETRIEVAL_BACKEND=numpy
+        export_embedding_matrix(vectorstore)
+
+    # 🔹 Invalidate answers cached against the previous index of this lecture
+    bump_index_version(lecture_id)
+
+
+def stream_lecture_index(vectorstore: Chroma, lecture_id: int, youtube_url: str, audio_path: str,
+                         chunking: dict = None, on_progress=None) -> list:
+    """
+    Transcribes a lecture window by window and indexes each window's segments as soon as they
+    are ready, so a long lecture becomes searchable progressively. Returns all segments.
+
+    Chunks are merged within an audio window, never across two.
+    """
+    vectorstore.delete(where={"lecture_id": lecture_id})
+    update_lexical_index(vectorstore, lecture_id, [], [], [])
+
+    transcript_chunks = []
+    for segments, position, duration in transcribe_windows(get_transcription_backend(), audio_path, vad=TRANSCRIBE_VAD):
+        if segments:
+            chunks = chunk_transcript(segments, chunking or CHUNKING)
+            docs, metadatas, ids = build_lecture_documents(lecture_id, youtube_url, chunks)
+            vectorstore.add_texts(texts=docs, metadatas=metadatas, ids=ids)
+            update_lexical_index(vectorstore, lecture_id, docs, metadatas, ids, replace=False)
+            bump_index_version(lecture_id)
+            transcript_chunks.extend(segments)
+        print(f"🎙️ Lecture {lecture_id}: {position / 60:.1f}/{duration / 60:.1f} min searchable")
+        if on_progress:
+            on_progress("transcribing", position / duration if duration else 1.0)
+
+    # 🔹 The exact-search matrix is exported once, after the last window
+    export_embedding_matrix(vectorstore)
+    return transcript_chunks
+
+
+def record_lecture_index(manifest: IndexManifest, lecture_id: int, youtube_url: str, audio_hash: str,
+                         transcript_chunks: list, chunking: dict = None):
+    chunking = chunking or CHUNKING
+    manifest.record(
+        lecture_id,
+        source_url=youtube_url,
+        audio_hash=audio_hash,
+        transcript_hash=transcript_sha256(transcript_chunks),
+        embedding_model=EMBEDDING_MODEL_NAME,
+        chunking=chunking,
+        chunk_count=len(chunk_transcript(transcript_chunks, chunking))
+    )
+
+
+def plan_lecture_index(manifest: IndexManifest, lecture_id: int, youtube_url: str, reindex: bool = False,
+                       chunking: dict = None) -> str:
+    """
+    SKIP, REEMBED or TRANSCRIBE, based on what changed since the lecture was last indexed.
+    """
+    if reindex:
+        return TRANSCRIBE
+    return manifest.plan(lecture_id, youtube_url, EMBEDDING_MODEL_NAME, chunking or CHUNKING,
+                         audio_hash=get_media_cache().cached_digest(youtube_url))
+
+
+def index_lecture_video(lecture_id: int, youtube_url: str, reindex: bool = False, manifest: IndexManifest = None,
+                        streaming: bool = True, chunking: dict = None, on_progress=None):
+    """
+    Transcribes a YouTube video and indexes the text with timestamps into ChromaDB.
+
+    Unchanged lectures are skipped and lectures whose embedding model or chunking changed are
+    re-embedded from the transcript store; `reindex=True` forces a fresh transcription.
+    With `streaming`, new transcripts are indexed window by window instead of at the end.
+    `on_progress(stage, fraction)` is called as the lecture moves through
+    downloading -> transcribing -> embedding.
+    """
+    on_progress = on_progress or (lambda stage, fraction: None)
+    print(f"📌 Checking lecture {lecture_id} for indexing...")
+
+    manifest = manifest or IndexManifest(MANIFEST_PATH)
+    action = plan_lecture_index(manifest, lecture_id, youtube_url, reindex, chunking)
+
+    if action == SKIP:
+        print(f"✅ Lecture {lecture_id} is already indexed. Skipping...")
+        return
+
+    # Initialize vector store
+    vectorstore = open_vectorstore()
+
+    transcript_chunks = None
+    if action == REEMBED:
+        print(f"📌 Re-embedding lecture {lecture_id} from its stored transcript...")
+        transcript_chunks = load_lecture_transcript(vectorstore, lecture_id)
+        audio_hash = manifest.get(lecture_id).get("audio_hash")
+
+    if not transcript_chunks:
+        print(f"📌 Indexing lecture {lecture_id}...")
+
+        on_progress("downloading", 0.0)
+        audio_path, audio_hash = fetch_lecture_audio(lecture_id, youtube_url)
+        if not reindex:
+            transcript_chunks = load_matching_transcript(lecture_id, audio_hash, WHISPER_MODEL_NAME)
+            if transcript_chunks:
+                print(f"📁 Reusing stored transcript for lecture {lecture_id}")
+
+    if transcript_chunks:
+        on_progress("embedding", 0.0)
+        write_lecture_index(vectorstore, lecture_id, youtube_url, transcript_chunks, chunking=chunking)
+    elif streaming:
+        # 🔹 Transcribe and index in overlapping windows
+        on_progress("transcribing", 0.0)
+        transcript_chunks = stream_lecture_index(vectorstore, lecture_id, youtube_url, audio_path, chunking,
+                                                 on_progress)
+        save_transcript(lecture_id, transcript_chunks, youtube_url, audio_hash, WHISPER_MODEL_NAME)
+    else:
+        # 🔹 Get transcript with timestamps
+        on_progress("transcribing", 0.0)
+        transcript_chunks = transcribe_audio(audio_path)
+        save_transcript(lecture_id, transcript_chunks, youtube_url, audio_hash, WHISPER_MODEL_NAME)
+        on_progress("embedding", 0.0)
+        write_lecture_index(vectorstore, lecture_id, youtube_url, transcript_chunks, chunking=chunking)
+
+    record_lecture_index(manifest, lecture_id, youtube_url, audio_hash, transcript_chunks, chunking)
 
     print(f"✅ Video lecture {lecture_id} indexed successfully!")
 
 
-def index_all_lectures():
+def rebuild_lexical_index(vectorstore: Chroma):
     """
-    Index all video lectures in the database.
+    Rebuilds the BM25 index from every chunk currently stored in Chroma.
     """
-    reindex = True
-    # Initialize DB session
-    db = SessionLocal()
-    try:
-        lectures = db.query(Lecture).filter(Lecture.type == 'Video').all()
-        # lectures = [lectures[0]]
+    stored = vectorstore.get(include=["documents", "metadatas"])
+    index = BM25Index()
+    index.add_documents(stored["ids"], stored["documents"], stored["metadatas"])
+    index.save(BM25_INDEX_PATH)
+    print(f"✅ Lexical index rebuilt with {len(index)} chunks")
+    return index
+
+
+def update_lexical_index(vectorstore: Chroma, lecture_id: int, docs: list, metadatas: list, ids: list,
+                         replace: bool = True):
+    """
+    Replaces (or with `replace=False`, extends) one lecture's chunks in the persisted BM25 index
+    (built from Chroma on first use).
+    """
+    if not os.path.exists(BM25_INDEX_PATH):
+        rebuild_lexical_index(vectorstore)
+        return
+
+    index = BM25Index.load(BM25_INDEX_PATH)
+    if replace:
+        index.remove_lecture(lecture_id)
+    index.add_documents(ids, docs, metadatas)
+    index.save(BM25_INDEX_PATH)
+
+
+def export_embedding_matrix(vectorstore: Chroma):
+    """
+    Exports every chunk embedding in Chroma to the memory-mapped NumPy store.
+    """
+    stored = vectorstore.get(include=["embeddings", "documents", "metadatas"])
+    if not stored["ids"]:
+        return
+    export_numpy_store(NUMPY_STORE_PATH, stored["ids"], stored["embeddings"], stored["documents"], stored["metadatas"])
 
-        for lecture in lectures:
-            if lecture.url is not None:
-                index_lecture_video(lecture_id=lecture.id, youtube_url=lecture.url, reindex=reindex)
 
-        print("✅ All lectures indexed successfully!")
+def get_video_lectures(lecture_ids: list = None):
+    """
+    Returns [(lecture_id, url)] for every video lecture with a URL.
+    """
+    db = SessionLocal()
+    try:
+        query = db.query(Lecture).filter(Lecture.type == 'Video', Lecture.url.isnot(None))
+        if lecture_ids:
+            query = query.filter(Lecture.id.in_(lecture_ids))
+        return [(lecture.id, lecture.url) for lecture in query.order_by(Lecture.id).all()]
     finally:
         db.close()
 
 
+def index_all_lectures(reindex: bool = False, streaming: bool = True, chunking: dict = None):
+    """
+    Index all video lectures in the database. Only lectures that changed are processed
+    unless `reindex` is set.
+    """
+    manifest = IndexManifest(MANIFEST_PATH)
+
+    for lecture_id, url in get_video_lectures():
+        index_lecture_video(lecture_id=lecture_id, youtube_url=url, reindex=reindex, manifest=manifest,
+                            streaming=streaming, chunking=chunking)
+
+    print("✅ All lectures indexed successfully!")
+
+
 if __name__ == "__main__":
-    index_all_lectures()
+    from ingest import main
+
+    main()
@@ -0,0 +1,86 @@
+import datetime
+import hashlib
+import json
+import os
+
+SKIP = "skip"
+REEMBED = "reembed"
+TRANSCRIBE = "transcribe"
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def transcript_sha256(transcript_chunks: list) -> str:
+    payload = json.dumps(
+        [[c["start_time"], c["end_time"], c["text"]] for c in transcript_chunks],
+        ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class IndexManifest:
+    """
+    Per-lecture record of what is in the index and what it was built from:
+    source URL, audio hash, transcript hash, embedding model and chunking parameters.
+
+    Only the indexing process (the single Chroma writer) updates it.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.lectures = {}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self.lectures = json.load(f).get("lectures", {})
+
+    def get(self, lecture_id: int):
+        return self.lectures.get(str(lecture_id))
+
+    def record(self, lecture_id: int, source_url: str, audio_hash: str, transcript_hash: str,
+               embedding_model: str, chunking: dict, chunk_count: int):
+        self.lectures[str(lecture_id)] = {
+            "source_url": source_url,
+            "audio_hash": audio_hash,
+            "transcript_hash": transcript_hash,
+            "embedding_model": embedding_model,
+            "chunking": chunking,
+            "chunk_count": chunk_count,
+            "indexed_at": datetime.datetime.utcnow().isoformat()
+        }
+        self.save()
+
+    def save(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"lectures": self.lectures}, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+    def plan(self, lecture_id: int, source_url: str, embedding_model: str, chunking: dict,
+             audio_hash: str = None) -> str:
+        """
+        Decides the cheapest action that brings a lecture up to date:
+
+        - TRANSCRIBE when it was never indexed, its URL changed, or its cached audio no longer matches
+        - REEMBED when only the embedding model or chunking parameters changed
+        - SKIP otherwise
+        """
+        entry = self.get(lecture_id)
+        if entry is None or entry.get("source_url") != source_url:
+            return TRANSCRIBE
+
+        if audio_hash and audio_hash != entry.get("audio_hash"):
+            return TRANSCRIBE
+
+        if entry.get("embedding_model") != embedding_model or entry.get("chunking") != chunking:
+            return REEMBED
+
+        return SKIP
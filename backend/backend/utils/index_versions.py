@@ -0,0 +1,56 @@
+import json
+import os
+import threading
+
+# ✅ Versions are bumped by the indexer whenever a lecture is (re)indexed; read by in-process caches
+from utils.config import INDEX_VERSIONS_PATH
+
+ALL_LECTURES = "all"
+
+_lock = threading.Lock()
+_cached = {"mtime": None, "versions": {}}
+
+
+def get_index_versions(path: str = INDEX_VERSIONS_PATH) -> dict:
+    """
+    Returns {lecture_id (str) or "all": version}. The file is re-read only when its mtime changes,
+    so API workers pick up re-indexing done by a separate indexing process.
+    """
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return {}
+
+    with _lock:
+        if _cached["mtime"] != mtime:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    _cached["versions"] = json.load(f)
+            except (OSError, ValueError):
+                _cached["versions"] = {}
+            _cached["mtime"] = mtime
+        return _cached["versions"]
+
+
+def get_index_version(lecture_id=ALL_LECTURES, path: str = INDEX_VERSIONS_PATH) -> int:
+    return get_index_versions(path).get(str(lecture_id), 0)
+
+
+def bump_index_version(lecture_id: int, path: str = INDEX_VERSIONS_PATH):
+    """Marks a lecture (and the cross-lecture scope) as changed."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            versions = json.load(f)
+    except (OSError, ValueError):
+        versions = {}
+
+    versions[str(lecture_id)] = versions.get(str(lecture_id), 0) + 1
+    versions[ALL_LECTURES] = versions.get(ALL_LECTURES, 0) + 1
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(versions, f)
+    os.replace(tmp_path, path)
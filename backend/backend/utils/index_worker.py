@@ -0,0 +1,71 @@
+"""
+Background indexing worker: polls the index_jobs table and indexes one lecture at a time.
+
+    python -m utils.index_worker            # run forever
+    python -m utils.index_worker --once     # drain the queue and exit
+
+Run as many workers as the machine has room for; jobs are claimed with FOR UPDATE SKIP LOCKED.
+Note that Chroma itself has a single writer per persist directory, so one worker per index host.
+"""
+import argparse
+import time
+import traceback
+
+from database.database import SessionLocal
+from models import Lecture
+from utils.config import MANIFEST_PATH
+from utils.index_jobs import claim_next_job, finish_job, update_job_progress
+from utils.index_lectures import index_lecture_video
+from utils.index_manifest import IndexManifest
+
+POLL_SECONDS = 5
+
+
+def run_job(db, job):
+    lecture = db.query(Lecture).filter(Lecture.id == job.lecture_id).first()
+    if lecture is None or not lecture.url:
+        raise ValueError(f"Lecture {job.lecture_id} does not exist or has no video URL")
+
+    index_lecture_video(
+        lecture_id=lecture.id,
+        youtube_url=lecture.url,
+        reindex=job.reindex,
+        manifest=IndexManifest(MANIFEST_PATH),
+        on_progress=lambda stage, fraction: update_job_progress(db, job, stage, fraction)
+    )
+
+
+def work(once: bool = False):
+    print("👷 Index worker started")
+    while True:
+        db = SessionLocal()
+        try:
+            job = claim_next_job(db)
+            if job is None:
+                if once:
+                    print("✅ Index queue is empty")
+                    return
+                time.sleep(POLL_SECONDS)
+                continue
+
+            print(f"📥 Claimed index job {job.id} for lecture {job.lecture_id} (attempt {job.attempts})")
+            try:
+                run_job(db, job)
+            except Exception as e:
+                db.rollback()
+                traceback.print_exc()
+                finish_job(db, job, error=f"{type(e).__name__}: {e}")
+                print(f"❌ Index job {job.id} failed during {job.stage}: {e}")
+            else:
+                finish_job(db, job)
+                print(f"✅ Index job {job.id} finished in {job.duration_seconds}s")
+        finally:
+            db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Process queued lecture indexing jobs.")
+    parser.add_argument("--once", action="store_true", help="Exit once the queue is empty")
+    args = parser.parse_args()
+
+    work(once=args.once)
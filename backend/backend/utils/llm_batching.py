@@ -0,0 +1,106 @@
+import queue
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import Future
+
+from utils.metrics import Histogram
+
+BATCH_SIZE_BUCKETS = [1, 2, 4, 8, 16, 32]
+QUEUE_WAIT_MS_BUCKETS = [1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000]
+
+
+class _PendingPrompt:
+    __slots__ = ("key", "prompt", "future", "enqueued_at")
+
+    def __init__(self, key: str, prompt: str):
+        self.key = key
+        self.prompt = prompt
+        self.future = Future()
+        self.enqueued_at = time.monotonic()
+
+
+class MicroBatcher:
+    """
+    Collects prompts that arrive within `max_wait_ms` of each other and runs them
+    through `run_batch(key, prompts)` as a single padded batch.
+
+    Prompts are grouped by `key` (the generation profile) so every batch shares the
+    same generation parameters. Each caller blocks on its own future only.
+    """
+
+    def __init__(self, run_batch, max_batch_size: int = 8, max_wait_ms: float = 25):
+        self.run_batch = run_batch
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait_ms / 1000.0
+        self.batch_sizes = Histogram(BATCH_SIZE_BUCKETS)
+        self.queue_wait_ms = Histogram(QUEUE_WAIT_MS_BUCKETS)
+
+        self._queue = queue.Queue()
+        self._worker = None
+        self._lock = threading.Lock()
+
+    def submit(self, key: str, prompt: str) -> Future:
+        self._ensure_worker()
+        pending = _PendingPrompt(key, prompt)
+        self._queue.put(pending)
+        return pending.future
+
+    def invoke(self, key: str, prompt: str) -> str:
+        return self.submit(key, prompt).result()
+
+    def stats(self) -> dict:
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+            "queued": self._queue.qsize(),
+            "batch_size": self.batch_sizes.snapshot(),
+            "queue_wait_ms": self.queue_wait_ms.snapshot()
+        }
+
+    def _ensure_worker(self):
+        if self._worker is not None:
+            return
+        with self._lock:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name="llm-micro-batcher", daemon=True)
+                self._worker.start()
+
+    def _collect(self):
+        """Block for the first prompt, then gather more until the batch is full or the window closes."""
+        batch = [self._queue.get()]
+        deadline = batch[0].enqueued_at + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+
+            groups = defaultdict(list)
+            for pending in batch:
+                groups[pending.key].append(pending)
+
+            for key, items in groups.items():
+                started_at = time.monotonic()
+                for pending in items:
+                    self.queue_wait_ms.observe((started_at - pending.enqueued_at) * 1000)
+                self.batch_sizes.observe(len(items))
+
+                try:
+                    outputs = self.run_batch(key, [pending.prompt for pending in items])
+                    for pending, output in zip(items, outputs):
+                        pending.future.set_result(output)
+                except Exception as e:
+                    for pending in items:
+                        if not pending.future.done():
+                            pending.future.set_exception(e)
@@ -0,0 +1,202 @@
+import os
+import queue
+import threading
+import time
+
+from utils.llm_batching import MicroBatcher
+from utils.llm_cache import LLMResponseCache
+
+# ✅ One model for the whole process, shared by every router
+LLM_NAME = "mistralai/Mistral-7B-Instruct-v0.1"
+
+# Micro-batching: prompts arriving within LLM_MAX_WAIT_MS are generated together
+LLM_MAX_BATCH_SIZE = int(os.getenv("LLM_MAX_BATCH_SIZE", 8))
+LLM_MAX_WAIT_MS = float(os.getenv("LLM_MAX_WAIT_MS", 25))
+
+# Streaming gives up if no new text arrives for this long (generation stuck or its thread gone)
+LLM_STREAM_TIMEOUT_SECONDS = float(os.getenv("LLM_STREAM_TIMEOUT_SECONDS", 120))
+
+# Exact-match response cache (in-memory LRU + sqlite file)
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", "cache/llm_responses.sqlite3")
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", 1024))
+LLM_CACHE_TTL_SECONDS = float(os.getenv("LLM_CACHE_TTL_SECONDS", 7 * 24 * 3600))
+
+# Generation profiles: name -> max_new_tokens
+GENERATION_PROFILES = {
+    "chat": 256,  # Lecture chat / RAG answers
+    "code": 512,  # Code exercises, test generation, code tutor
+}
+
+# Passed on every batched call (and part of the response cache key): completions only, without the prompt
+GENERATION_KWARGS = {"return_full_text": False}
+
+
+class LLMProfile:
+    """
+    A named view over the shared model with its own generation parameters.
+    Exposes the same `invoke` call the routes already use.
+    """
+
+    def __init__(self, service, name: str, max_new_tokens: int):
+        self.service = service
+        self.name = name
+        self.max_new_tokens = max_new_tokens
+
+    def invoke(self, prompt: str, cache: bool = True) -> str:
+        """
+        Generates a completion. Identical prompts are answered from the response cache
+        unless `cache=False` (for call sites whose output should not be reused).
+        """
+        if not cache:
+            return self._generate(prompt)
+
+        key = LLMResponseCache.make_key(prompt, self.service.model_name,
+                                        {"max_new_tokens": self.max_new_tokens, **GENERATION_KWARGS})
+        response = self.service.cache.get(key)
+        if response is None:
+            response = self._generate(prompt)
+            self.service.cache.set(key, response)
+        return response
+
+    def _generate(self, prompt: str) -> str:
+        # Queued behind the micro-batcher so concurrent requests share one forward pass
+        return self.service.batcher.invoke(self.name, prompt)
+
+    def generate_batch(self, prompts: list) -> list:
+        # Generation parameters go on every call; the shared pipeline carries none of its own.
+        # batch_size pads the prompts into one forward pass (the pipeline default is one at a time).
+        outputs = self.service.pipe(prompts, batch_size=len(prompts), max_new_tokens=self.max_new_tokens,
+                                    **GENERATION_KWARGS)
+        return [output[0]["generated_text"] for output in outputs]
+
+    def count_tokens(self, text: str) -> int:
+        return len(self.service.tokenizer.encode(text, add_special_tokens=False))
+
+    def stream(self, prompt: str):
+        """Yields decoded text pieces as the model generates them."""
+        return self.service.stream(prompt, max_new_tokens=self.max_new_tokens)
+
+
+class LLMService:
+    """
+    Owns the single tokenizer/model/pipeline instance and hands out generation profiles.
+    """
+
+    def __init__(self, model_name: str = LLM_NAME, profiles: dict = None,
+                 max_batch_size: int = LLM_MAX_BATCH_SIZE, max_wait_ms: float = LLM_MAX_WAIT_MS):
+        from transformers import AutoModelForCausalLM, AutoTokenizer, pipeline
+
+        self.model_name = model_name
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+        # Batched generation needs a pad token; left padding keeps prompts adjacent to new tokens
+        if self.tokenizer.pad_token is None:
+            self.tokenizer.pad_token = self.tokenizer.eos_token
+        self.tokenizer.padding_side = "left"
+        self.model = AutoModelForCausalLM.from_pretrained(
+            model_name,
+            torch_dtype="auto",
+            device_map="auto"
+        )
+        self.model.generation_config.pad_token_id = self.tokenizer.pad_token_id
+        self.pipe = pipeline(
+            "text-generation",
+            model=self.model,
+            tokenizer=self.tokenizer
+        )
+        self.batcher = MicroBatcher(self._run_batch, max_batch_size=max_batch_size, max_wait_ms=max_wait_ms)
+        self.cache = LLMResponseCache(LLM_CACHE_PATH, max_entries=LLM_CACHE_MAX_ENTRIES,
+                                      ttl_seconds=LLM_CACHE_TTL_SECONDS)
+        self.profiles = {
+            name: LLMProfile(self, name, max_new_tokens)
+            for name, max_new_tokens in (profiles or GENERATION_PROFILES).items()
+        }
+
+    def profile(self, name: str) -> LLMProfile:
+        if name not in self.profiles:
+            raise KeyError(f"Unknown generation profile: {name}")
+        return self.profiles[name]
+
+    def stream(self, prompt: str, max_new_tokens: int):
+        """
+        Runs `generate` on a background thread and yields text from a TextIteratorStreamer.
+        Only newly generated tokens are yielded (the prompt is skipped). An exception raised
+        by `generate` is re-raised here once the stream has ended.
+        """
+        from transformers import TextIteratorStreamer
+
+        streamer = TextIteratorStreamer(self.tokenizer, skip_prompt=True, skip_special_tokens=True,
+                                        timeout=LLM_STREAM_TIMEOUT_SECONDS)
+        inputs = self.tokenizer(prompt, return_tensors="pt").to(self.model.device)
+        errors = []
+
+        def generate():
+            try:
+                self.model.generate(**inputs, streamer=streamer, max_new_tokens=max_new_tokens)
+            except Exception as e:
+                errors.append(e)
+                # Without the end signal the consumer would wait on the streamer forever
+                streamer.end()
+
+        thread = threading.Thread(target=generate, daemon=True)
+        thread.start()
+        try:
+            for text in streamer:
+                if text:
+                    yield text
+        except queue.Empty:
+            raise TimeoutError(f"LLM produced no output for {LLM_STREAM_TIMEOUT_SECONDS:.0f}s")
+        finally:
+            thread.join(timeout=LLM_STREAM_TIMEOUT_SECONDS)
+
+        if errors:
+            raise errors[0]
+
+    def _run_batch(self, profile_name: str, prompts: list) -> list:
+        return self.profile(profile_name).generate_batch(prompts)
+
+    def stats(self) -> dict:
+        return {
+            "model": self.model_name,
+            "profiles": {name: p.max_new_tokens for name, p in self.profiles.items()},
+            "batching": self.batcher.stats(),
+            "cache": self.cache.stats()
+        }
+
+
+_llm_service = None
+_llm_service_lock = threading.Lock()
+
+
+def load_llm_service() -> LLMService:
+    """
+    Loads the model on first call (startup warmup or the first AI request) and returns the
+    process-wide service. Concurrent callers wait for the one load in progress.
+    """
+    global _llm_service
+    if _llm_service is None:
+        with _llm_service_lock:
+            if _llm_service is None:
+                started_at = time.perf_counter()
+                print(f"⏳ Loading {LLM_NAME}...")
+                _llm_service = LLMService()
+                print(f"⏱️ Loaded {LLM_NAME} in {time.perf_counter() - started_at:.1f}s")
+    return _llm_service
+
+
+def is_llm_loaded() -> bool:
+    return _llm_service is not None
+
+
+def get_llm_service() -> LLMService:
+    """FastAPI dependency returning the process-wide LLM service."""
+    return load_llm_service()
+
+
+def get_chat_llm() -> LLMProfile:
+    """FastAPI dependency for lecture chat generation (256 new tokens)."""
+    return load_llm_service().profile("chat")
+
+
+def get_code_llm() -> LLMProfile:
+    """FastAPI dependency for code exercise generation (512 new tokens)."""
+    return load_llm_service().profile("code")
@@ -0,0 +1,210 @@
+"""
+Content-addressed cache of lecture audio, stored once as 16 kHz mono 16-bit PCM WAV
+(Whisper's native input), so re-transcription needs neither the network nor ffmpeg.
+
+    python -m utils.media_cache add https://youtu.be/... lectures/week1.mp4
+    python -m utils.media_cache stats
+
+Sources (URLs or local files) map to a SHA-256 of the normalized audio; identical audio
+from different sources is stored once. Least recently used objects are evicted once the
+cache exceeds its disk budget.
+"""
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+import wave
+
+from utils.config import MEDIA_CACHE_DIR
+from utils.index_manifest import file_sha256
+
+MEDIA_CACHE_MAX_BYTES = int(float(os.getenv("MEDIA_CACHE_MAX_GB", "20")) * 1024 ** 3)
+SAMPLE_RATE = 16000
+
+
+def source_key(source: str) -> str:
+    """URLs are keyed as-is; local files by path, size and mtime so edited files are re-ingested."""
+    if os.path.exists(source):
+        stat = os.stat(source)
+        return f"file:{os.path.abspath(source)}:{stat.st_size}:{stat.st_mtime_ns}"
+    return source
+
+
+def download_source_audio(url: str, directory: str) -> str:
+    """Downloads the best audio stream as-is (no lossy re-encode); it is normalized afterwards."""
+    import yt_dlp
+
+    ydl_opts = {
+        'format': 'bestaudio/best',
+        'outtmpl': os.path.join(directory, '%(id)s.%(ext)s'),
+        'quiet': True,
+    }
+    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+        info = ydl.extract_info(url, download=True)
+        return ydl.prepare_filename(info)
+
+
+def normalize_audio(input_path: str, output_path: str):
+    from pydub import AudioSegment
+
+    audio = AudioSegment.from_file(input_path)
+    audio = audio.set_frame_rate(SAMPLE_RATE).set_channels(1).set_sample_width(2)
+    audio.export(output_path, format="wav")
+
+
+class MediaCache:
+    def __init__(self, directory: str = MEDIA_CACHE_DIR, max_bytes: int = MEDIA_CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.join(directory, "objects"), exist_ok=True)
+        self._db = sqlite3.connect(os.path.join(directory, "index.sqlite3"), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS objects ("
+            "digest TEXT PRIMARY KEY, size INTEGER NOT NULL, created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS sources (source TEXT PRIMARY KEY, digest TEXT NOT NULL, added_at REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS ix_objects_accessed_at ON objects (accessed_at)")
+        self._db.commit()
+
+    def object_path(self, digest: str) -> str:
+        return os.path.join(self.directory, "objects", digest[:2], f"{digest}.wav")
+
+    def cached_digest(self, source: str):
+        """Digest of a source's audio if it is in the cache, without fetching anything."""
+        with self._lock:
+            row = self._db.execute("SELECT digest FROM sources WHERE source = ?", (source_key(source),)).fetchone()
+        if row and os.path.exists(self.object_path(row[0])):
+            return row[0]
+        return None
+
+    def fetch(self, source: str):
+        """
+        Returns (wav_path, digest) for a URL or local media file, downloading and normalizing
+        it only if this source isn't cached yet.
+        """
+        key = source_key(source)
+        digest = self.cached_digest(source)
+        if digest:
+            self._touch(digest)
+            return self.object_path(digest), digest
+
+        with tempfile.TemporaryDirectory(dir=self.directory) as tmp:
+            if os.path.exists(source):
+                original = source
+            else:
+                print(f"⬇️  Downloading audio from {source}")
+                original = download_source_audio(source, tmp)
+
+            normalized = os.path.join(tmp, "audio.wav")
+            normalize_audio(original, normalized)
+            digest = file_sha256(normalized)
+            path = self.object_path(digest)
+            size = os.path.getsize(normalized)
+
+            with self._lock:
+                if os.path.exists(path):
+                    print(f"♻️  {source} has the same audio as an already cached source")
+                else:
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    shutil.move(normalized, path)
+                now = time.time()
+                self._db.execute(
+                    "INSERT OR REPLACE INTO objects (digest, size, created_at, accessed_at) VALUES "
+                    "(?, ?, COALESCE((SELECT created_at FROM objects WHERE digest = ?), ?), ?)",
+                    (digest, size, digest, now, now)
+                )
+                self._db.execute(
+                    "INSERT OR REPLACE INTO sources (source, digest, added_at) VALUES (?, ?, ?)", (key, digest, now)
+                )
+                self._db.commit()
+                self._evict(keep=digest)
+
+        return path, digest
+
+    def stats(self) -> dict:
+        with self._lock:
+            objects, total = self._db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM objects").fetchone()
+            sources = self._db.execute("SELECT COUNT(*) FROM sources").fetchone()[0]
+        return {"objects": objects, "sources": sources, "bytes": total, "max_bytes": self.max_bytes}
+
+    def _touch(self, digest: str):
+        with self._lock:
+            self._db.execute("UPDATE objects SET accessed_at = ? WHERE digest = ?", (time.time(), digest))
+            self._db.commit()
+
+    def _evict(self, keep: str = None):
+        """Caller must hold the lock. Removes least recently used objects beyond the disk budget."""
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM objects").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        for digest, size in self._db.execute("SELECT digest, size FROM objects ORDER BY accessed_at").fetchall():
+            if total <= self.max_bytes:
+                break
+            if digest == keep:
+                continue
+            try:
+                os.remove(self.object_path(digest))
+            except FileNotFoundError:
+                pass
+            self._db.execute("DELETE FROM objects WHERE digest = ?", (digest,))
+            self._db.execute("DELETE FROM sources WHERE digest = ?", (digest,))
+            total -= size
+            print(f"🧹 Evicted cached audio {digest[:12]} ({size / 1024 ** 2:.0f} MB)")
+        self._db.commit()
+
+
+def read_wav_frames(path: str, start: float = 0.0, duration: float = None):
+    """
+    Reads [start, start + duration) seconds of a PCM WAV with the stdlib `wave` module, no ffmpeg.
+    Returns (frames, sample_width, frame_rate, channels).
+    """
+    with wave.open(path, "rb") as f:
+        rate = f.getframerate()
+        f.setpos(min(int(start * rate), f.getnframes()))
+        count = f.getnframes() if duration is None else int(duration * rate)
+        return f.readframes(count), f.getsampwidth(), rate, f.getnchannels()
+
+
+def wav_duration(path: str) -> float:
+    with wave.open(path, "rb") as f:
+        return f.getnframes() / f.getframerate()
+
+
+_media_cache = None
+_media_cache_lock = threading.Lock()
+
+
+def get_media_cache() -> MediaCache:
+    """Process-wide cache, opened on first use (download threads share it)."""
+    global _media_cache
+    if _media_cache is None:
+        with _media_cache_lock:
+            if _media_cache is None:
+                _media_cache = MediaCache()
+    return _media_cache
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Manage the lecture audio cache.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    add_parser = subparsers.add_parser("add", help="Download / ingest and normalize media into the cache")
+    add_parser.add_argument("sources", nargs="+", help="URLs or local media files")
+    subparsers.add_parser("stats", help="Show cache size and contents")
+    args = parser.parse_args()
+
+    cache = get_media_cache()
+    if args.command == "add":
+        for source in args.sources:
+            path, digest = cache.fetch(source)
+            print(f"✅ {source} -> {path}")
+    print(cache.stats())
@@ -0,0 +1,67 @@
+"""
+Keyset (cursor) pagination over (created_at, id).
+
+Pages are fetched with `WHERE (created_at, id) < (cursor)` instead of OFFSET, so every page
+is one index range scan no matter how deep into a history it is. Responses keep their plain
+list bodies (the frontend reads arrays); the cursor for the next page is sent in the
+X-Next-Cursor header and passed back as `?cursor=`.
+"""
+import base64
+import datetime
+import json
+
+from fastapi import HTTPException, Query, Response
+from sqlalchemy import tuple_
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(created_at: datetime.datetime, row_id: int) -> str:
+    raw = json.dumps([created_at.isoformat(), row_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str):
+    """Returns (created_at, id); a malformed cursor is the client's fault, so 400."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, row_id = json.loads(raw)
+        return datetime.datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def page_limit(default: int = DEFAULT_PAGE_SIZE):
+    return Query(default, ge=1, le=MAX_PAGE_SIZE, description="Page size")
+
+
+def keyset_page(query, model, cursor: str = None, limit: int = DEFAULT_PAGE_SIZE, newest_first: bool = True):
+    """
+    Restricts a Query or select() over `model` to the page after `cursor`, in (created_at, id)
+    order, fetching one extra row so `split_page` can tell whether another page exists.
+    """
+    key = tuple_(model.created_at, model.id)
+    if cursor:
+        after = tuple_(*decode_cursor(cursor))
+        query = query.filter(key < after if newest_first else key > after)
+
+    if newest_first:
+        query = query.order_by(model.created_at.desc(), model.id.desc())
+    else:
+        query = query.order_by(model.created_at, model.id)
+    return query.limit(limit + 1)
+
+
+def split_page(rows, limit: int, response: Response = None):
+    """
+    Drops the look-ahead row and returns (items, next_cursor). If a response is given,
+    the cursor is also set as its X-Next-Cursor header.
+    """
+    rows = list(rows)
+    items = rows[:limit]
+    next_cursor = encode_cursor(items[-1].created_at, items[-1].id) if len(rows) > limit else None
+    if response is not None and next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return items, next_cursor
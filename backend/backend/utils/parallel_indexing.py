@@ -0,0 +1,187 @@
+"""
+Parallel lecture ingestion.
+
+    python ingest.py index --parallel --download-workers 4 --transcribe-workers 2 --embed-workers 1 --resume
+
+Stages run concurrently across lectures, each with its own concurrency limit:
+downloads into the media cache in a thread pool (network / ffmpeg bound), Whisper
+transcription and embedding in separate process pools (CPU bound). Chroma is only
+written from this main process.
+
+The index manifest decides per lecture whether to skip it, re-embed its stored transcript,
+or run the full pipeline; pass --force to re-transcribe everything.
+"""
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+from utils.index_lectures import (
+    CHUNKING,
+    WHISPER_MODEL_NAME,
+    fetch_lecture_audio,
+    export_embedding_matrix,
+    get_embeddings,
+    load_lecture_transcript,
+    open_vectorstore,
+    plan_lecture_index,
+    rebuild_lexical_index,
+    record_lecture_index,
+    transcribe_audio,
+    write_lecture_index,
+)
+from utils.chunking import chunk_transcript
+from utils.config import CHROMA_DB_PATH, MANIFEST_PATH
+from utils.index_manifest import REEMBED, SKIP, IndexManifest
+from utils.transcript_store import load_matching_transcript, save_transcript
+
+PROGRESS_PATH = os.path.join(CHROMA_DB_PATH, "index_progress.json")
+
+
+class IndexProgress:
+    """
+    Records completed lecture ids so an interrupted run can resume where it stopped.
+    """
+
+    def __init__(self, path: str = PROGRESS_PATH, resume: bool = False):
+        self.path = path
+        self.completed = set()
+        if resume and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self.completed = set(json.load(f).get("completed", []))
+
+    def mark_done(self, lecture_id: int):
+        self.completed.add(lecture_id)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"completed": sorted(self.completed)}, f)
+        os.replace(tmp_path, self.path)
+
+
+def _init_worker(torch_threads: int):
+    """Keeps concurrent workers from oversubscribing the CPU."""
+    import torch
+
+    torch.set_num_threads(torch_threads)
+
+
+def _download(lecture_id: int, youtube_url: str) -> tuple:
+    return fetch_lecture_audio(lecture_id, youtube_url)
+
+
+def _transcribe(audio_path: str) -> list:
+    return transcribe_audio(audio_path)
+
+
+def _embed(texts: list) -> list:
+    return get_embeddings().embed_documents(texts)
+
+
+def index_lectures_parallel(lectures: list, download_workers: int = 4, transcribe_workers: int = 2,
+                            embed_workers: int = 1, resume: bool = False, reindex: bool = False,
+                            chunking: dict = None):
+    """
+    Indexes [(lecture_id, url)] through the download -> transcribe -> embed -> write pipeline.
+    """
+    chunking = chunking or CHUNKING
+    progress = IndexProgress(resume=resume)
+    todo = [(lecture_id, url) for lecture_id, url in lectures if lecture_id not in progress.completed]
+    if resume and len(lectures) != len(todo):
+        print(f"⏩ Resuming: {len(lectures) - len(todo)} lecture(s) already indexed")
+
+    manifest = IndexManifest(MANIFEST_PATH)
+    actions = {lecture_id: plan_lecture_index(manifest, lecture_id, url, reindex, chunking) for lecture_id, url in todo}
+    unchanged = [lecture_id for lecture_id, action in actions.items() if action == SKIP]
+    if unchanged:
+        print(f"⏩ Skipping {len(unchanged)} unchanged lecture(s)")
+    todo = [(lecture_id, url) for lecture_id, url in todo if actions[lecture_id] != SKIP]
+    total = len(todo)
+    if not todo:
+        print("✅ Nothing to index.")
+        return
+
+    cpu_count = os.cpu_count() or 1
+    torch_threads = max(1, cpu_count // max(1, transcribe_workers + embed_workers))
+    context = multiprocessing.get_context("spawn")
+
+    vectorstore = open_vectorstore()
+    urls = dict(todo)
+    transcripts = {}
+    audio_hashes = {}
+    failed = {}
+    done = 0
+    started_at = time.time()
+
+    with ThreadPoolExecutor(max_workers=download_workers) as download_pool, \
+            ProcessPoolExecutor(max_workers=transcribe_workers, mp_context=context,
+                                initializer=_init_worker, initargs=(torch_threads,)) as transcribe_pool, \
+            ProcessPoolExecutor(max_workers=embed_workers, mp_context=context,
+                                initializer=_init_worker, initargs=(torch_threads,)) as embed_pool:
+
+        pending = {}
+        for lecture_id, url in todo:
+            if actions[lecture_id] == REEMBED:
+                # Only the model or chunking changed: reuse the stored transcript
+                transcript = load_lecture_transcript(vectorstore, lecture_id)
+                if transcript:
+                    transcripts[lecture_id] = transcript
+                    audio_hashes[lecture_id] = manifest.get(lecture_id).get("audio_hash")
+                    texts = [chunk["text"] for chunk in chunk_transcript(transcript, chunking)]
+                    pending[embed_pool.submit(_embed, texts)] = ("embed", lecture_id)
+                    continue
+            pending[download_pool.submit(_download, lecture_id, url)] = ("download", lecture_id)
+
+        while pending:
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                stage, lecture_id = pending.pop(future)
+                # Whatever a stage's handling does (disk writes, Chroma upserts), a failure
+                # only fails this lecture; the rest keep going and still get exported.
+                try:
+                    result = future.result()
+
+                    if stage == "download":
+                        audio_path, audio_hashes[lecture_id] = result
+                        stored = None if reindex else load_matching_transcript(
+                            lecture_id, audio_hashes[lecture_id], WHISPER_MODEL_NAME)
+                        if stored:
+                            transcripts[lecture_id] = stored
+                            print(f"📁 Lecture {lecture_id} has a stored transcript, queued for embedding")
+                            texts = [chunk["text"] for chunk in chunk_transcript(stored, chunking)]
+                            pending[embed_pool.submit(_embed, texts)] = ("embed", lecture_id)
+                        else:
+                            print(f"⬇️  Lecture {lecture_id} downloaded, queued for transcription")
+                            pending[transcribe_pool.submit(_transcribe, audio_path)] = ("transcribe", lecture_id)
+
+                    elif stage == "transcribe":
+                        save_transcript(lecture_id, result, urls[lecture_id], audio_hashes[lecture_id], WHISPER_MODEL_NAME)
+                        transcripts[lecture_id] = result
+                        print(f"📝 Lecture {lecture_id} transcribed ({len(result)} segments), queued for embedding")
+                        texts = [chunk["text"] for chunk in chunk_transcript(result, chunking)]
+                        pending[embed_pool.submit(_embed, texts)] = ("embed", lecture_id)
+
+                    elif stage == "embed":
+                        # Single writer: only this process touches Chroma
+                        transcript = transcripts.pop(lecture_id)
+                        write_lecture_index(vectorstore, lecture_id, urls[lecture_id], transcript,
+                                            vectors=result, refresh_exports=False, chunking=chunking)
+                        record_lecture_index(manifest, lecture_id, urls[lecture_id], audio_hashes.pop(lecture_id),
+                                             transcript, chunking)
+                        progress.mark_done(lecture_id)
+                        done += 1
+                        elapsed = time.time() - started_at
+                        print(f"✅ [{done}/{total}] Lecture {lecture_id} indexed ({elapsed:.0f}s elapsed)")
+                except Exception as e:
+                    failed[lecture_id] = f"{stage}: {e}"
+                    transcripts.pop(lecture_id, None)
+                    audio_hashes.pop(lecture_id, None)
+                    print(f"❌ Lecture {lecture_id} failed during {stage}: {e}")
+
+    if done:
+        rebuild_lexical_index(vectorstore)
+        export_embedding_matrix(vectorstore)
+
+    print(f"🏁 Indexed {done}/{total} lecture(s) in {time.time() - started_at:.0f}s")
+    if failed:
+        print(f"⚠️ {len(failed)} lecture(s) failed; re-run with --resume to retry them: {failed}")
@@ -0,0 +1,130 @@
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from utils.index_versions import ALL_LECTURES, get_index_version
+
+
+class _Bucket:
+    """Answered questions for one (lecture, scope), stored as a normalized embedding matrix."""
+
+    def __init__(self, index_version: int, dim: int, capacity: int):
+        self.index_version = index_version
+        self.vectors = np.zeros((capacity, dim), dtype=np.float32)
+        self.questions = []
+        self.payloads = []
+        self.last_used = []
+
+    def __len__(self):
+        return len(self.payloads)
+
+
+class SemanticAnswerCache:
+    """
+    Per-lecture cache of answered questions keyed by question embedding.
+
+    A new question is answered from the cache when its cosine similarity to an earlier
+    question in the same lecture and scope is at least `threshold`. Buckets are bounded
+    (least recently used answer is evicted) and dropped when the lecture's index version
+    changes, i.e. after `index_lecture_video` re-indexes it.
+    """
+
+    def __init__(self, embed_fn, threshold: float = 0.92, max_entries_per_lecture: int = 200,
+                 max_lectures: int = 500):
+        self.embed_fn = embed_fn
+        self.threshold = threshold
+        self.max_entries_per_lecture = max_entries_per_lecture
+        self.max_lectures = max_lectures
+
+        self._buckets = OrderedDict()  # (lecture_id, scope) -> _Bucket
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+
+    def _embed(self, question: str) -> np.ndarray:
+        vector = np.asarray(self.embed_fn(question.strip()), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    @staticmethod
+    def _current_version(lecture_id: int, scope: str) -> int:
+        # Cross-lecture answers depend on every lecture, so they follow the global version
+        return get_index_version(lecture_id if scope == "lecture" else ALL_LECTURES)
+
+    def lookup(self, lecture_id: int, scope: str, question: str):
+        """Returns the stored answer payload for a near-duplicate question, or None."""
+        key = (lecture_id, scope)
+        version = self._current_version(lecture_id, scope)
+
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is not None and bucket.index_version != version:
+                del self._buckets[key]
+                self._counters["invalidations"] += 1
+                bucket = None
+            if bucket is None or not len(bucket):
+                self._counters["misses"] += 1
+                return None
+
+        vector = self._embed(question)
+
+        with self._lock:
+            if self._buckets.get(key) is not bucket:
+                self._counters["misses"] += 1
+                return None
+
+            scores = bucket.vectors[:len(bucket)] @ vector
+            best = int(np.argmax(scores))
+            if scores[best] < self.threshold:
+                self._counters["misses"] += 1
+                return None
+
+            bucket.last_used[best] = time.monotonic()
+            self._buckets.move_to_end(key)
+            self._counters["hits"] += 1
+            return bucket.payloads[best]
+
+    def store(self, lecture_id: int, scope: str, question: str, payload: dict):
+        vector = self._embed(question)
+        key = (lecture_id, scope)
+        version = self._current_version(lecture_id, scope)
+
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None or bucket.index_version != version:
+                bucket = _Bucket(version, vector.shape[0], self.max_entries_per_lecture)
+                self._buckets[key] = bucket
+            self._buckets.move_to_end(key)
+
+            if len(bucket) < self.max_entries_per_lecture:
+                slot = len(bucket)
+                bucket.questions.append(question)
+                bucket.payloads.append(payload)
+                bucket.last_used.append(time.monotonic())
+            else:
+                slot = int(np.argmin(bucket.last_used))
+                bucket.questions[slot] = question
+                bucket.payloads[slot] = payload
+                bucket.last_used[slot] = time.monotonic()
+                self._counters["evictions"] += 1
+            bucket.vectors[slot] = vector
+
+            while len(self._buckets) > self.max_lectures:
+                _, evicted = self._buckets.popitem(last=False)
+                self._counters["evictions"] += len(evicted)
+
+    def invalidate(self, lecture_id: int = None):
+        """Drops cached answers for one lecture (all scopes), or everything when lecture_id is None."""
+        with self._lock:
+            keys = [key for key in self._buckets if lecture_id is None or key[0] == lecture_id]
+            for key in keys:
+                del self._buckets[key]
+            self._counters["invalidations"] += len(keys)
+
+    def stats(self) -> dict:
+        with self._lock:
+            counters = dict(self._counters)
+            counters["lectures"] = len(self._buckets)
+            counters["entries"] = sum(len(bucket) for bucket in self._buckets.values())
+        return counters
@@ -0,0 +1,33 @@
+import json
+
+from sqlalchemy.orm import Session
+
+from models.settings import Settings
+
+
+def sse_event(event: str, data) -> str:
+    """Formats one Server-Sent Events frame."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+def is_streaming_enabled(db: Session) -> bool:
+    """
+    Reads `Settings.streaming_mode`. When it is off, streaming endpoints still use the
+    SSE protocol but send the whole answer as a single token event.
+    """
+    settings = db.query(Settings).first()
+    return bool(settings.streaming_mode) if settings else True
+
+
+def stream_generation(llm, prompt: str, streaming: bool, parts: list):
+    """
+    Yields generated text pieces from `llm.stream`, appending each one to `parts`.
+    With streaming disabled, the pieces are buffered and yielded once at the end.
+    """
+    for piece in llm.stream(prompt):
+        parts.append(piece)
+        if streaming:
+            yield piece
+
+    if not streaming and parts:
+        yield "".join(parts)
@@ -0,0 +1,115 @@
+import numpy as np
+from pydub import AudioSegment
+from pydub.utils import mediainfo
+
+from utils.media_cache import read_wav_frames, wav_duration
+from utils.vad import trim_silence
+
+WHISPER_SAMPLE_RATE = 16000
+WINDOW_SECONDS = 120
+OVERLAP_SECONDS = 10
+
+
+def is_wav(audio_path: str) -> bool:
+    return audio_path.lower().endswith(".wav")
+
+
+def audio_duration(audio_path: str) -> float:
+    if is_wav(audio_path):
+        return wav_duration(audio_path)
+    return float(mediainfo(audio_path)["duration"])
+
+
+def to_whisper_samples(audio: AudioSegment) -> np.ndarray:
+    """16 kHz mono float32 in [-1, 1], the input Whisper expects."""
+    audio = audio.set_frame_rate(WHISPER_SAMPLE_RATE).set_channels(1).set_sample_width(2)
+    return np.array(audio.get_array_of_samples(), dtype=np.float32) / 32768.0
+
+
+def load_audio(audio_path: str, start: float = 0.0, duration: float = None) -> AudioSegment:
+    """
+    Loads [start, start + duration) of a file. Cached WAVs are read directly without ffmpeg;
+    anything else is decoded by ffmpeg, which seeks to the window.
+    """
+    if is_wav(audio_path):
+        frames, sample_width, frame_rate, channels = read_wav_frames(audio_path, start, duration)
+        return AudioSegment(data=frames, sample_width=sample_width, frame_rate=frame_rate, channels=channels)
+    if duration is None and not start:
+        return AudioSegment.from_file(audio_path)
+    return AudioSegment.from_file(audio_path, start_second=start, duration=duration)
+
+
+def transcribe_clip(backend, audio: AudioSegment, vad: bool = True, initial_prompt: str = None):
+    """
+    Transcribes one clip, optionally with silence cut out first. Returns (segments, speech_seconds);
+    segment times are relative to the start of the clip as recorded, not the trimmed audio.
+    """
+    offsets = None
+    if vad:
+        audio, offsets = trim_silence(audio)
+        if len(audio) == 0:
+            return [], 0.0
+
+    segments = []
+    for segment in backend.transcribe(to_whisper_samples(audio), initial_prompt=initial_prompt):
+        start, end = segment["start"], segment["end"]
+        if offsets is not None:
+            start, end = offsets.to_original(start), offsets.to_original(end, end=True)
+        segments.append({"start": start, "end": end, "text": segment["text"]})
+    return segments, len(audio) / 1000
+
+
+def report_skipped(audio_path: str, duration: float, speech_seconds: float):
+    if duration > 0:
+        skipped = 100 * (1 - speech_seconds / duration)
+        print(f"🔇 Skipped {skipped:.1f}% of {audio_path} as silence ({duration / 60:.1f} min total)")
+
+
+def transcribe_windows(backend, audio_path: str, window_seconds: float = WINDOW_SECONDS,
+                       overlap_seconds: float = OVERLAP_SECONDS, vad: bool = True):
+    """
+    Transcribes a lecture in overlapping windows, yielding (segments, position, duration) as each
+    window finishes. Only one window of decoded audio is held in memory at a time.
+
+    Segments carry absolute start/end times. Where windows overlap, a segment belongs to the window
+    whose half of the overlap it starts in, so nothing is emitted twice.
+    """
+    duration = audio_duration(audio_path)
+    step = max(1.0, window_seconds - overlap_seconds)
+    committed_until = 0.0
+    previous_text = ""
+    speech_seconds = 0.0
+    start = 0.0
+
+    while start < duration:
+        end = min(start + window_seconds, duration)
+        is_last = end >= duration
+        boundary = duration if is_last else end - overlap_seconds / 2
+
+        window = load_audio(audio_path, start, end - start)
+        window_segments, window_speech = transcribe_clip(backend, window, vad, previous_text[-200:] or None)
+        del window
+
+        segments = []
+        for segment in window_segments:
+            segment_start = start + segment["start"]
+            if committed_until <= segment_start < boundary:
+                segments.append({
+                    "start_time": round(segment_start, 2),
+                    "end_time": round(min(start + segment["end"], duration), 2),
+                    "text": segment["text"]
+                })
+
+        # Speech inside the overlap is transcribed twice; count only the part this window commits
+        speech_seconds += window_speech * (min(boundary, end) - max(committed_until, start)) / max(end - start, 1e-9)
+        if segments:
+            previous_text = " ".join(segment["text"] for segment in segments)
+        committed_until = boundary
+        yield segments, end, duration
+
+        if is_last:
+            break
+        start += step
+
+    if vad:
+        report_skipped(audio_path, duration, speech_seconds)
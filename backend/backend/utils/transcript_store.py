@@ -0,0 +1,52 @@
+import datetime
+import gzip
+import json
+import os
+
+from utils.config import TRANSCRIPTS_DIR
+
+
+def transcript_path(lecture_id: int, directory: str = TRANSCRIPTS_DIR) -> str:
+    return os.path.join(directory, f"lecture_{lecture_id}.json.gz")
+
+
+def save_transcript(lecture_id: int, segments: list, source_url: str, audio_hash: str, model: str,
+                    directory: str = TRANSCRIPTS_DIR):
+    """
+    Persists a lecture's Whisper segments (start_time, end_time, text) as gzipped JSON,
+    so re-chunking or re-embedding never has to transcribe the audio again.
+    """
+    os.makedirs(directory, exist_ok=True)
+    path = transcript_path(lecture_id, directory)
+    payload = {
+        "lecture_id": lecture_id,
+        "source_url": source_url,
+        "audio_hash": audio_hash,
+        "model": model,
+        "created_at": datetime.datetime.utcnow().isoformat(),
+        "segments": [
+            {"start_time": s["start_time"], "end_time": s["end_time"], "text": s["text"]}
+            for s in segments
+        ]
+    }
+    tmp_path = path + ".tmp"
+    with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def load_transcript(lecture_id: int, directory: str = TRANSCRIPTS_DIR):
+    """Returns the stored transcript record for a lecture, or None if it was never saved."""
+    path = transcript_path(lecture_id, directory)
+    if not os.path.exists(path):
+        return None
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_matching_transcript(lecture_id: int, audio_hash: str, model: str, directory: str = TRANSCRIPTS_DIR):
+    """Returns the stored segments only if they were produced from this audio by this model."""
+    stored = load_transcript(lecture_id, directory)
+    if stored and stored.get("audio_hash") == audio_hash and stored.get("model") == model:
+        return stored["segments"]
+    return None
@@ -0,0 +1,95 @@
+import os
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+# ✅ Transcription settings (env overridable)
+TRANSCRIBE_BACKEND = os.getenv("TRANSCRIBE_BACKEND", "openai-whisper")
+WHISPER_MODEL_SIZE = os.getenv("WHISPER_MODEL_SIZE", "small")
+WHISPER_COMPUTE_TYPE = os.getenv("WHISPER_COMPUTE_TYPE", "int8")
+WHISPER_CPU_THREADS = int(os.getenv("WHISPER_CPU_THREADS", "0"))
+
+
+class TranscriptionBackend(ABC):
+    """
+    A speech-to-text model on CPU. `transcribe` takes 16 kHz mono float32 samples and
+    returns [{"start", "end", "text"}] with times in seconds.
+    """
+
+    name = None
+
+    def __init__(self, model_size: str, compute_type: str):
+        self.model_size = model_size
+        self.compute_type = compute_type
+
+    def __repr__(self):
+        return f"{self.name}:{self.model_size}:{self.compute_type}"
+
+    @abstractmethod
+    def transcribe(self, samples: np.ndarray, initial_prompt: str = None) -> list:
+        """Returns [{"start", "end", "text"}] for the samples."""
+
+
+class OpenAIWhisperBackend(TranscriptionBackend):
+    """Reference openai-whisper implementation (PyTorch, fp32 on CPU)."""
+
+    name = "openai-whisper"
+
+    def __init__(self, model_size: str, compute_type: str = "float32"):
+        import whisper
+
+        super().__init__(model_size, "float32")
+        self.model = whisper.load_model(model_size, device="cpu")
+
+    def transcribe(self, samples: np.ndarray, initial_prompt: str = None) -> list:
+        result = self.model.transcribe(samples, fp16=False, initial_prompt=initial_prompt)
+        return [
+            {"start": segment["start"], "end": segment["end"], "text": segment["text"]}
+            for segment in result["segments"]
+        ]
+
+
+class FasterWhisperBackend(TranscriptionBackend):
+    """CTranslate2 (faster-whisper) implementation; int8 weights by default."""
+
+    name = "faster-whisper"
+
+    def __init__(self, model_size: str, compute_type: str = "int8"):
+        try:
+            from faster_whisper import WhisperModel
+        except ImportError:
+            raise RuntimeError("TRANSCRIBE_BACKEND=faster-whisper requires the faster-whisper package")
+
+        super().__init__(model_size, compute_type)
+        self.model = WhisperModel(model_size, device="cpu", compute_type=compute_type,
+                                  cpu_threads=WHISPER_CPU_THREADS)
+
+    def transcribe(self, samples: np.ndarray, initial_prompt: str = None) -> list:
+        segments, _ = self.model.transcribe(samples, beam_size=5, initial_prompt=initial_prompt)
+        # `segments` is a generator; decoding happens while it is consumed
+        return [{"start": segment.start, "end": segment.end, "text": segment.text} for segment in segments]
+
+
+TRANSCRIPTION_BACKENDS = {
+    OpenAIWhisperBackend.name: OpenAIWhisperBackend,
+    FasterWhisperBackend.name: FasterWhisperBackend,
+}
+
+
+def load_transcription_backend(name: str = None, model_size: str = None, compute_type: str = None):
+    name = name or TRANSCRIBE_BACKEND
+    if name not in TRANSCRIPTION_BACKENDS:
+        raise ValueError(f"Unknown transcription backend '{name}', expected one of {sorted(TRANSCRIPTION_BACKENDS)}")
+    return TRANSCRIPTION_BACKENDS[name](model_size or WHISPER_MODEL_SIZE, compute_type or WHISPER_COMPUTE_TYPE)
+
+
+def to_transcript_chunks(segments: list, offset: float = 0.0) -> list:
+    """Normalizes backend segments into the indexed {start_time, end_time, text} format."""
+    return [
+        {
+            "start_time": round(offset + segment["start"], 2),
+            "end_time": round(offset + segment["end"], 2),
+            "text": segment["text"]
+        }
+        for segment in segments
+    ]
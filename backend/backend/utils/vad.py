@@ -0,0 +1,69 @@
+import bisect
+
+from pydub import AudioSegment
+from pydub.silence import detect_nonsilent
+
+# Quieter than the clip's average loudness by this much counts as silence
+SILENCE_BELOW_AVERAGE_DB = 16
+MIN_SILENCE_MS = 1000
+# Speech kept on each side of a detected region so words aren't clipped
+PADDING_MS = 200
+# Silence is scanned in steps of this many ms; 1 ms steps would measure ~3.6M one-second windows per hour
+SEEK_STEP_MS = 20
+
+
+class OffsetMap:
+    """
+    Maps times in speech-only audio back to the original recording.
+
+    Holds one (trimmed_start, original_start, length) span per kept region, in seconds.
+    """
+
+    def __init__(self, spans: list):
+        self.spans = spans
+        self._starts = [span[0] for span in spans]
+
+    def to_original(self, t: float, end: bool = False) -> float:
+        if not self.spans:
+            return t
+        # An end time on a span boundary belongs to the span before it
+        position = bisect.bisect_left(self._starts, t) if end else bisect.bisect_right(self._starts, t)
+        trimmed_start, original_start, length = self.spans[max(0, position - 1)]
+        return original_start + min(max(t - trimmed_start, 0.0), length)
+
+
+def speech_ranges(audio: AudioSegment) -> list:
+    """Returns merged [start_ms, end_ms] regions containing speech, padded on both sides."""
+    if len(audio) == 0 or audio.dBFS == float("-inf"):
+        return []
+
+    ranges = detect_nonsilent(
+        audio,
+        min_silence_len=MIN_SILENCE_MS,
+        silence_thresh=audio.dBFS - SILENCE_BELOW_AVERAGE_DB,
+        seek_step=SEEK_STEP_MS
+    )
+
+    merged = []
+    for start, end in ranges:
+        start, end = max(0, start - PADDING_MS), min(len(audio), end + PADDING_MS)
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+
+def trim_silence(audio: AudioSegment):
+    """
+    Drops the non-speech regions of a clip. Returns (speech_only_audio, offset_map).
+    """
+    chunks = []
+    spans = []
+    position = 0
+    for start, end in speech_ranges(audio):
+        spans.append((position / 1000, start / 1000, (end - start) / 1000))
+        chunks.append(audio[start:end].raw_data)
+        position += end - start
+    # One join instead of `+=` per region, which would copy the growing buffer every time
+    return audio._spawn(b"".join(chunks)), OffsetMap(spans)
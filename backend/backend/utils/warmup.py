@@ -0,0 +1,54 @@
+import os
+import threading
+import time
+
+# ✅ Load models in the background at startup (set WARMUP_ON_STARTUP=0 to load on first use only)
+WARMUP_ON_STARTUP = os.getenv("WARMUP_ON_STARTUP", "1") != "0"
+
+
+class Warmup:
+    """
+    Loads the AI components on a background thread, one after another, recording how long each
+    took. Readiness is judged by each component's own `is_ready` check, so components loaded
+    lazily by a request count as well.
+    """
+
+    def __init__(self):
+        self.components = {}  # name -> {"load", "is_ready", "seconds", "error"}
+        self.started_at = None
+        self.finished_at = None
+        self._thread = None
+
+    def register(self, name: str, load, is_ready):
+        self.components[name] = {"load": load, "is_ready": is_ready, "seconds": None, "error": None}
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="model-warmup", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        self.started_at = time.perf_counter()
+        print("🔥 Warming up models in the background...")
+        for name, component in self.components.items():
+            started_at = time.perf_counter()
+            try:
+                component["load"]()
+            except Exception as e:
+                component["error"] = f"{type(e).__name__}: {e}"
+                print(f"❌ Warmup of {name} failed: {e}")
+            component["seconds"] = round(time.perf_counter() - started_at, 2)
+            print(f"⏱️ Warmup: {name} took {component['seconds']}s")
+        self.finished_at = time.perf_counter()
+        print(f"✅ Warmup finished in {self.finished_at - self.started_at:.1f}s")
+
+    def status(self):
+        """Returns (ready, {name: {"ready", "seconds", "error"}})."""
+        components = {
+            name: {"ready": bool(c["is_ready"]()), "seconds": c["seconds"], "error": c["error"]}
+            for name, c in self.components.items()
+        }
+        return all(c["ready"] for c in components.values()), components
+
+
+warmup = Warmup()